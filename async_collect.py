@@ -0,0 +1,236 @@
+from typing import List, Dict, Optional, Any, Tuple
+import asyncio
+import json
+import random
+import time
+
+import aiohttp
+import pandas as pd
+
+from checkpoint import COMPLETED, FAILED, NOT_FOUND, CollectionCheckpoint
+from columnar_io import write_parquet
+from rate_limit import DEFAULT_REQUESTS_PER_SECOND, RateLimiter, get_rate_limiter
+from telemetry import get_telemetry
+import dataCollect
+from dataCollect import (
+    OUTPUT_COLUMNS,
+    AuthorRowAccumulator,
+    build_works_url,
+    career_years_from_groups,
+    clean_author_name,
+    first_last_query,
+    get_response_cache,
+    pick_best_match,
+)
+
+
+# Concurrent OpenAlex collection: many authors are resolved and paged at once over
+# one pooled session, and every request waits on the process-wide rate limiter from
+# rate_limit.py (the same one dataCollect.safe_request uses) instead of a fixed sleep
+# between pages.
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+# async counterpart of safe_request, returns (status, json or None)
+async def safe_request_async(session: aiohttp.ClientSession, url: str, limiter: RateLimiter,
+                             max_retries: int = 5) -> Tuple[int, Optional[Dict[str, Any]]]:
+    telemetry = get_telemetry()
+    cache = get_response_cache()
+    if cache is not None:
+        cached = cache.get(url)
+        if cached is not None:
+            telemetry.record_cache_hit(url)
+            return cached.status_code, cached.json()
+        if cache.offline:
+            return 504, None
+
+    status = 0
+    for attempt in range(max_retries):
+        if attempt:
+            telemetry.record_retry(url)
+        await limiter.acquire()
+        start = time.perf_counter()
+        try:
+            async with session.get(url) as r:
+                status = r.status
+                if status == 200:
+                    content = await r.read()
+                    telemetry.record_request(url, status, time.perf_counter() - start, len(content))
+                    if cache is not None:
+                        cache.put(url, status, content)
+                    return status, json.loads(content)
+                telemetry.record_request(url, status, time.perf_counter() - start, r.content_length or 0)
+                if status == 429:
+                    # the wait itself is spent (and recorded) in limiter.acquire
+                    wait = float(r.headers.get("Retry-After", random.uniform(30, 60)))
+                    limiter.block_for(wait)
+                    continue
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # dropped connection or timeout, retried like a 5xx; status 0 if it never recovers
+            print(f"Request failed for {url}: {type(e).__name__}")
+            status = 0
+            telemetry.record_request(url, status, time.perf_counter() - start, 0)
+        if status == 0 or 500 <= status < 600:
+            wait = random.uniform(5, 10)
+            telemetry.record_sleep("server_error", wait)
+            await asyncio.sleep(wait)
+            continue
+        break
+    return status, None
+
+
+# one search request per author, mirrors resolve_author
+async def resolve_author_async(session, limiter, author_name: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    status, data = await safe_request_async(session, f"{dataCollect.BASE_URL}/authors?search={author_name}", limiter)
+    if status != 200:
+        print(f"Error searching for {author_name}: {status}")
+        return FAILED, None
+    match = pick_best_match(author_name, data.get("results", []))
+
+    query = first_last_query(author_name)
+    if match is None and query and query != author_name:
+        status, data = await safe_request_async(session, f"{dataCollect.BASE_URL}/authors?search={query}", limiter)
+        if status != 200:
+            print(f"Error searching for {query}: {status}")
+            return FAILED, None
+        match = pick_best_match(query, data.get("results", []))
+
+    return (COMPLETED if match else NOT_FOUND), match
+
+
+async def collect_papers_one_row_per_paper_async(session, limiter, author_name: str) -> List[Dict[str, Any]]:
+    return (await collect_author_async(session, limiter, author_name))[1]
+
+
+async def collect_author_async(session, limiter, author_name: str,
+                               projected: bool = False) -> Tuple[str, List[Dict[str, Any]]]:
+    start = time.perf_counter()
+    stats = {"pages": 0}
+    status, rows = await _collect_author_async(session, limiter, author_name, projected, stats)
+    get_telemetry().record_author(status, stats["pages"], time.perf_counter() - start)
+    return status, rows
+
+
+async def _collect_author_async(session, limiter, author_name: str, projected: bool,
+                                stats: Dict[str, int]) -> Tuple[str, List[Dict[str, Any]]]:
+    resolution, author_info = await resolve_author_async(session, limiter, author_name)
+    if resolution != COMPLETED:
+        if resolution == NOT_FOUND:
+            print(f"No author found for {author_name}")
+        return resolution, []
+
+    author_id = author_info["id"]
+    display_name = author_info["display_name"]
+    print(f"Found OpenAlex author for {author_name}: {display_name}")
+
+    year_bounds = None
+    if projected:
+        status, data = await safe_request_async(
+            session, f"{dataCollect.BASE_URL}/works?filter=author.id:{author_id}&group_by=publication_year", limiter)
+        if status != 200:
+            print(f"Error fetching publication years for {author_name}: {status}")
+            return FAILED, []
+        year_bounds = career_years_from_groups(data.get("group_by", []))
+        if year_bounds is None:
+            return COMPLETED, []
+
+    # pages of one author stay sequential, the cursor comes from the previous page
+    works_url = build_works_url(author_id, projected)
+    cursor = "*"
+    fetched = 0
+    rows = []
+    acc = AuthorRowAccumulator(display_name, year_bounds, author_id)
+    outcome = COMPLETED
+    while True:
+        status, data = await safe_request_async(session, f"{works_url}&cursor={cursor}", limiter)
+        if status != 200:
+            print(f"Error fetching works for {author_name}: {status}")
+            outcome = FAILED
+            break
+
+        works = data.get("results", [])
+        if not works:
+            break
+        fetched += len(works)
+        stats["pages"] += 1
+        # each page is reduced to rows (or compact records) and dropped
+        rows.extend(acc.add_page(works))
+
+        cursor = data.get("meta", {}).get("next_cursor")
+        if not cursor:
+            print(f"Completed fetching all {fetched} works for {display_name}")
+            break
+
+    rows.extend(acc.finish())
+    return outcome, rows
+
+
+async def collect_for_authors_async(author_names: List[str],
+                                    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                                    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                                    checkpoint_path: Optional[str] = None,
+                                    projected: bool = False,
+                                    telemetry_path: Optional[str] = None) -> pd.DataFrame:
+    checkpoint = CollectionCheckpoint(checkpoint_path, columns=OUTPUT_COLUMNS) if checkpoint_path else None
+    if checkpoint is not None:
+        author_names = checkpoint.pending(author_names)
+
+    limiter = get_rate_limiter(requests_per_second)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency, keepalive_timeout=60)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def one_author(raw_name):
+            async with semaphore:
+                try:
+                    status, rows = await collect_author_async(session, limiter, clean_author_name(raw_name),
+                                                              projected)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    # e.g. a body that is not JSON; this author is retried on the next run
+                    print(f"Collection failed for {raw_name}: {e!r}")
+                    status, rows = FAILED, []
+            # record runs on the event loop thread, so appends never interleave
+            if checkpoint is not None:
+                checkpoint.record(raw_name, status, rows)
+            return rows
+
+        # gather keeps the input order of authors in the output; an author that still
+        # raises doesn't cancel the others
+        results = await asyncio.gather(*(one_author(n) for n in author_names), return_exceptions=True)
+        for name, result in zip(author_names, results):
+            if isinstance(result, BaseException):
+                print(f"Collection failed for {name}: {result!r}")
+
+    if telemetry_path:
+        get_telemetry().dump(telemetry_path)
+    if checkpoint is not None:
+        print(f"Checkpoint summary: {checkpoint.summary()}")
+        return checkpoint.load_rows()
+    all_rows = [row for rows in results if not isinstance(rows, BaseException) for row in rows]
+    return pd.DataFrame(all_rows, columns=OUTPUT_COLUMNS)
+
+
+# sync entry point, same shape as collect_for_authors_one_row
+def collect_for_authors_concurrent(author_names: List[str],
+                                   requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                                   max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                                   checkpoint_path: Optional[str] = None,
+                                   projected: bool = False,
+                                   telemetry_path: Optional[str] = None) -> pd.DataFrame:
+    return asyncio.run(collect_for_authors_async(author_names, requests_per_second, max_concurrency,
+                                                 checkpoint_path, projected, telemetry_path))
+
+
+def collect_from_csv_concurrent(csv_path: str, author_column: str, **kwargs) -> pd.DataFrame:
+    df_authors = pd.read_csv(csv_path)
+    author_names = df_authors[author_column].dropna().unique().tolist()
+    return collect_for_authors_concurrent(author_names, **kwargs)
+
+
+if __name__ == "__main__":
+    df = collect_from_csv_concurrent("missing.csv", "Full Name", checkpoint_path="newmissing.csv",
+                                     telemetry_path="newmissing.telemetry.json")
+    print("Saved results to newmissing.csv")
+    write_parquet(df, "newmissing.parquet")
+    print("Saved results to newmissing.parquet")
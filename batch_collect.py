@@ -0,0 +1,165 @@
+from typing import List, Dict, Optional, Any, Tuple
+import random
+import time
+
+import pandas as pd
+
+from checkpoint import COMPLETED, FAILED, NOT_FOUND, CollectionCheckpoint
+from telemetry import get_telemetry
+import dataCollect
+from dataCollect import (
+    OUTPUT_COLUMNS,
+    WORK_FIELDS,
+    YEARS_OF_INTEREST,
+    build_author_rows,
+    clean_author_name,
+    compact_work,
+    fetch_career_years,
+    resolve_authors_batch,
+    safe_request,
+)
+
+
+# Batched works collection: works for a group of author IDs are fetched with one
+# author.id:A|B|C filter, every returned work is stored once for the whole batch
+# and then routed to each tracked author listed in its authorships.
+
+DEFAULT_BATCH_SIZE = 25
+
+
+# "https://openalex.org/A123" -> "A123"
+def short_id(openalex_id: str) -> str:
+    return openalex_id.rstrip("/").rsplit("/", 1)[-1] if openalex_id else ""
+
+
+# extra_filter is appended to the filter (e.g. from_updated_date:2025-01-01) and
+# select overrides the projected field list
+def build_batch_works_url(author_ids: List[str], projected: bool = False, extra_filter: Optional[str] = None,
+                          select: Optional[List[str]] = None) -> str:
+    filters = f"author.id:{'|'.join(short_id(a) for a in author_ids)}"
+    if projected:
+        filters += f",publication_year:{min(YEARS_OF_INTEREST)}-{max(YEARS_OF_INTEREST)}"
+        select = select or WORK_FIELDS
+    if extra_filter:
+        filters += f",{extra_filter}"
+    url = f"{dataCollect.BASE_URL}/works?filter={filters}&per-page=200"
+    if select:
+        url += f"&select={','.join(select)}"
+    return url
+
+
+# returns (status, works by dedupe key, author id -> list of dedupe keys); stats["pages"]
+# counts the pages fetched when a stats dict is passed
+def fetch_works_for_author_batch(author_ids: List[str], projected: bool = False, extra_filter: Optional[str] = None,
+                                 select: Optional[List[str]] = None, use_cache: bool = True,
+                                 stats: Optional[Dict[str, int]] = None
+                                 ) -> Tuple[str, Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+    tracked = {short_id(a) for a in author_ids}
+    unique_works: Dict[str, Dict[str, Any]] = {}
+    routes: Dict[str, List[str]] = {a: [] for a in tracked}
+
+    works_url = build_batch_works_url(author_ids, projected, extra_filter, select)
+    cursor = "*"
+    while True:
+        r = safe_request(f"{works_url}&cursor={cursor}", use_cache=use_cache)
+        if r.status_code != 200:
+            print(f"Error fetching works for batch of {len(author_ids)} authors: {r.status_code}")
+            return FAILED, unique_works, routes
+
+        data = r.json()
+        works = data.get("results", [])
+        if not works:
+            break
+        if stats is not None:
+            stats["pages"] = stats.get("pages", 0) + 1
+
+        for w in works:
+            key = w.get("doi") or w.get("id")
+            # a paper shared by several tracked authors is kept once for the batch
+            if key in unique_works:
+                continue
+            # only the fields the row builder needs are kept for the rest of the batch
+            unique_works[key] = compact_work(w)
+            seen = set()
+            for a in w.get("authorships", []):
+                author_id = short_id((a.get("author") or {}).get("id", ""))
+                if author_id in tracked and author_id not in seen:
+                    seen.add(author_id)
+                    routes[author_id].append(key)
+
+        print(f"Fetched {len(unique_works)} / {data.get('meta', {}).get('count', '?')} works for batch")
+        cursor = data.get("meta", {}).get("next_cursor")
+        if not cursor:
+            break
+        if not getattr(r, "from_cache", False):
+            pause = random.uniform(*dataCollect.PAGE_PAUSE_SECONDS)
+            get_telemetry().record_sleep("page_pause", pause)
+            time.sleep(pause)
+
+    return COMPLETED, unique_works, routes
+
+
+def collect_authors_batched(author_names: List[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                            projected: bool = False, checkpoint_path: Optional[str] = None,
+                            telemetry_path: Optional[str] = None) -> pd.DataFrame:
+    checkpoint = CollectionCheckpoint(checkpoint_path, columns=OUTPUT_COLUMNS) if checkpoint_path else None
+    if checkpoint is not None:
+        author_names = checkpoint.pending(author_names)
+
+    telemetry = get_telemetry()
+    cleaned = {raw: clean_author_name(raw) for raw in author_names}
+    start = time.perf_counter()
+    resolved = resolve_authors_batch(list(cleaned.values()), batch_size=batch_size)
+    # batch requests are shared, so their time is split evenly over the authors served
+    resolve_share = (time.perf_counter() - start) / max(len(cleaned), 1)
+
+    found = []
+    all_rows = []
+    for raw, name in cleaned.items():
+        # names that clean to nothing are never sent and count as not found
+        entry = resolved.get(name, {"author": None, "status": NOT_FOUND})
+        author_info = entry["author"]
+        if author_info is None:
+            if entry["status"] == FAILED:
+                print(f"Could not resolve {name}, will retry on the next run")
+            else:
+                print(f"No author found for {name}")
+            if checkpoint is not None:
+                checkpoint.record(raw, entry["status"])
+            telemetry.record_author(entry["status"], 0, resolve_share)
+            continue
+        found.append((raw, author_info))
+
+    for i in range(0, len(found), batch_size):
+        batch = found[i:i + batch_size]
+        stats = {"pages": 0}
+        start = time.perf_counter()
+        status, unique_works, routes = fetch_works_for_author_batch([info["id"] for _, info in batch], projected,
+                                                                    stats=stats)
+        batch_share = (time.perf_counter() - start) / len(batch)
+
+        for raw, author_info in batch:
+            author_start = time.perf_counter()
+            rows = []
+            author_status = status
+            if status == COMPLETED:
+                year_bounds = None
+                if projected:
+                    author_status, year_bounds = fetch_career_years(author_info["id"])
+                if author_status == COMPLETED and (year_bounds is not None or not projected):
+                    works = [unique_works[k] for k in routes[short_id(author_info["id"])]]
+                    rows = build_author_rows(works, author_info["display_name"], year_bounds,
+                                             author_info["id"])
+            if checkpoint is not None:
+                checkpoint.record(raw, author_status, rows)
+            all_rows.extend(rows)
+            # every author of the batch is served by all of the batch's pages
+            telemetry.record_author(author_status, stats["pages"],
+                                    resolve_share + batch_share + time.perf_counter() - author_start)
+
+    if telemetry_path:
+        get_telemetry().dump(telemetry_path)
+    if checkpoint is not None:
+        print(f"Checkpoint summary: {checkpoint.summary()}")
+        return checkpoint.load_rows()
+    return pd.DataFrame(all_rows, columns=OUTPUT_COLUMNS)
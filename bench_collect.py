@@ -0,0 +1,85 @@
+from typing import List, Dict, Any
+import argparse
+import json
+import time
+
+import dataCollect
+from async_collect import collect_for_authors_concurrent
+from batch_collect import collect_authors_batched
+from dataCollect import collect_for_authors_one_row, configure_cache, set_base_url
+from fake_openalex import FakeOpenAlex, FaultConfig, synthetic_fixture
+from telemetry import get_telemetry
+
+
+# Authors-per-minute benchmark of the collectors against the local fake OpenAlex
+# server, so sequential / concurrent / batched modes can be compared offline.
+#
+#   python bench_collect.py --authors 50 --latency 0.05 --burst-every 200 --burst-length 3
+
+
+def run_mode(mode: str, names: List[str], args) -> Dict[str, Any]:
+    get_telemetry().reset()
+    start = time.perf_counter()
+    if mode == "sequential":
+        df = collect_for_authors_one_row(names, projected=args.projected)
+    elif mode == "concurrent":
+        df = collect_for_authors_concurrent(names, requests_per_second=args.rps,
+                                            max_concurrency=args.concurrency, projected=args.projected)
+    elif mode == "batched":
+        df = collect_authors_batched(names, projected=args.projected)
+    else:
+        raise ValueError(f"unknown mode {mode}")
+    elapsed = time.perf_counter() - start
+
+    summary = get_telemetry().summary()
+    requests = sum(e["requests"] for e in summary["endpoints"].values())
+    return {
+        "mode": mode,
+        "authors": len(names),
+        "rows": len(df),
+        "seconds": round(elapsed, 3),
+        "authors_per_minute": round(len(names) / elapsed * 60, 1) if elapsed else None,
+        "requests": requests,
+        "sleep_seconds": summary["sleep_seconds"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark collectors against fake_openalex")
+    parser.add_argument("--authors", type=int, default=50)
+    parser.add_argument("--works-per-author", type=int, default=40)
+    parser.add_argument("--modes", nargs="+", default=["sequential", "concurrent", "batched"])
+    parser.add_argument("--projected", action="store_true")
+    parser.add_argument("--rps", type=float, default=8)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--burst-every", type=int, default=0)
+    parser.add_argument("--burst-length", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    # the sequential collector normally pauses 2.5-3.5 s between works pages
+    parser.add_argument("--page-pause", type=float, nargs=2, default=list(dataCollect.PAGE_PAUSE_SECONDS))
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    fixture = synthetic_fixture(args.authors, args.works_per_author)
+    names = [a["display_name"] for a in fixture["authors"]]
+    faults = FaultConfig(latency=args.latency, burst_every=args.burst_every, burst_length=args.burst_length,
+                         retry_after=1.0, error_rate=args.error_rate)
+
+    # every mode has to hit the server, not the response cache
+    configure_cache(enabled=False)
+    dataCollect.PAGE_PAUSE_SECONDS = tuple(args.page_pause)
+
+    results = []
+    with FakeOpenAlex(fixture, faults) as api:
+        set_base_url(api.base_url)
+        for mode in args.modes:
+            result = run_mode(mode, names, args)
+            results.append(result)
+            print(f"{mode}: {result['authors_per_minute']} authors/min "
+                  f"({result['requests']} requests, {result['seconds']} s)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.output}")
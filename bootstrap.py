@@ -0,0 +1,103 @@
+from typing import List, Dict, Optional, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+import pandas as pd
+
+from graph_index import GraphIndex
+from network_metrics import network_summary
+from sparse_graph import InternedRows, sparse_from_pairs
+
+
+# Resampling engine for the sampled-cohort analysis. Instead of one sample_authors_by_seed
+# draw, each (cohort, year, fraction) gets n_draws subsamples of the cohort's authors,
+# each from its own numpy Generator spawned off one SeedSequence, so results don't
+# depend on the number of workers or how draws are chunked. The interned rows are
+# handed to every worker once through the pool initializer; tasks only carry the spec
+# and their seed sequences.
+#
+#   draws, intervals = bootstrap_networks(index, fractions=[0.5, 0.75], n_draws=1000)
+
+METRICS = ["num_nodes", "num_edges", "avg_degree", "density", "unique_coauthors", "cluster_coefficient"]
+
+_worker: Dict[str, Any] = {}
+
+
+# the platform's default start method (spawn on macOS and Windows); scripts that use a
+# pool keep their body under if __name__ == "__main__" so workers can import them
+def worker_pool(workers: int, initializer, initargs: tuple) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs)
+
+
+def _init_worker(rows: InternedRows, positions: Dict[Tuple[str, int], np.ndarray],
+                 cohort_authors: Dict[str, np.ndarray], clustering: Optional[str]):
+    _worker.update(rows=rows, positions=positions, cohort_authors=cohort_authors, clustering=clustering)
+
+
+# network summary for one subsample: int(n * fraction) cohort authors without replacement,
+# like sample_authors_by_seed, then the year's rows of those authors
+def _draw(group: str, year: int, fraction: float, seed: np.random.SeedSequence) -> Dict[str, Any]:
+    rows: InternedRows = _worker["rows"]
+    cohort = _worker["cohort_authors"][group]
+    sampled = np.random.default_rng(seed).choice(cohort, size=int(len(cohort) * fraction), replace=False)
+    positions = _worker["positions"].get((group, year), np.empty(0, dtype=np.int64))
+    positions = positions[np.isin(rows.authors[positions], sampled)]
+    authors, coauthors = rows.pairs(positions)
+    graph = sparse_from_pairs(rows.index, rows.authors[positions], authors, coauthors)
+    return network_summary(graph, _worker["clustering"])
+
+
+def _run_chunk(group: str, year: int, fraction: float, first_draw: int,
+               seeds: List[np.random.SeedSequence]) -> List[Dict[str, Any]]:
+    return [{"group": group, "year": year, "fraction": fraction, "draw": first_draw + i,
+             **_draw(group, year, fraction, seed)} for i, seed in enumerate(seeds)]
+
+
+# percentile intervals plus mean / std per metric
+def confidence_intervals(draws: pd.DataFrame, confidence: float = 0.95,
+                         metrics: Optional[List[str]] = None) -> pd.DataFrame:
+    metrics = [m for m in (metrics or METRICS) if m in draws.columns]
+    tail = (1 - confidence) / 2
+    long = draws.melt(id_vars=["group", "year", "fraction"], value_vars=metrics, var_name="metric")
+    grouped = long.groupby(["group", "year", "fraction", "metric"], sort=False)["value"]
+    table = grouped.agg(["mean", "std", "count"])
+    table["lower"] = grouped.quantile(tail)
+    table["upper"] = grouped.quantile(1 - tail)
+    return table.reset_index()
+
+
+def bootstrap_networks(index: GraphIndex, fractions: List[float], n_draws: int = 1000,
+                       specs: Optional[List[Tuple[str, int]]] = None, seed: int = 35,
+                       workers: Optional[int] = None, chunk_size: int = 50, confidence: float = 0.95,
+                       clustering: Optional[str] = "exact") -> Tuple[pd.DataFrame, pd.DataFrame]:
+    specs = specs or list(index.keys())
+    rows = index.rows
+    positions = {key: index.positions(*key) for key in specs}
+    cohort_authors = {
+        group: np.unique(rows.authors[np.flatnonzero((index.df["group"] == group).to_numpy())])
+        for group in {g for g, _ in specs}
+    }
+
+    # one child sequence per (spec, fraction), then one per draw
+    root = np.random.SeedSequence(seed)
+    combos = [(group, year, fraction) for group, year in specs for fraction in fractions]
+    tasks = []
+    for (group, year, fraction), spec_seed in zip(combos, root.spawn(len(combos))):
+        draw_seeds = spec_seed.spawn(n_draws)
+        for start in range(0, n_draws, chunk_size):
+            tasks.append((group, year, fraction, start, draw_seeds[start:start + chunk_size]))
+
+    initargs = (rows, positions, cohort_authors, clustering)
+    workers = workers or os.cpu_count() or 1
+    records: List[Dict[str, Any]] = []
+    if workers == 1:
+        _init_worker(*initargs)
+        for task in tasks:
+            records.extend(_run_chunk(*task))
+    else:
+        with worker_pool(workers, _init_worker, initargs) as pool:
+            for chunk in pool.map(_run_chunk, *zip(*tasks)):
+                records.extend(chunk)
+
+    draws = pd.DataFrame(records)
+    return draws, confidence_intervals(draws, confidence)
@@ -0,0 +1,113 @@
+from typing import List, Dict, Optional, Any, Iterable
+import json
+import os
+import time
+
+import pandas as pd
+
+
+# Per-author checkpointing for collection runs. Rows are appended to the output CSV
+# as they are produced, and a JSON-lines manifest records the outcome of each author
+# plus the CSV size after its rows were written. Rows of an author that did not
+# complete are cut off again, so a restarted run skips completed and not-found
+# authors and only retries the failed ones.
+
+COMPLETED = "completed"
+FAILED = "failed"
+NOT_FOUND = "not_found"
+
+# authors in these states are not collected again
+DONE_STATUSES = {COMPLETED, NOT_FOUND}
+
+
+class CollectionCheckpoint:
+    def __init__(self, output_path: str, manifest_path: Optional[str] = None,
+                 columns: Optional[List[str]] = None):
+        self.output_path = output_path
+        self.manifest_path = manifest_path or f"{output_path}.manifest.jsonl"
+        self.columns = columns
+        self.statuses: Dict[str, str] = {}
+        # output size after the last recorded author
+        self._end_offset = 0
+        self._pending_rows = 0
+        self._load_manifest()
+
+    def _load_manifest(self):
+        last_offset = 0
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # torn last line from a crash, that author gets retried
+                        continue
+                    self.statuses[entry["author"]] = entry["status"]
+                    last_offset = entry.get("end_offset", last_offset)
+
+        # rows written after the last manifest entry belong to an author that never finished
+        self._end_offset = last_offset
+        self._truncate_unrecorded()
+
+    def _truncate_unrecorded(self):
+        if os.path.exists(self.output_path) and os.path.getsize(self.output_path) > self._end_offset:
+            with open(self.output_path, "r+b") as f:
+                f.truncate(self._end_offset)
+
+    def is_done(self, author: str) -> bool:
+        return self.statuses.get(author) in DONE_STATUSES
+
+    def pending(self, authors: Iterable[str]) -> List[str]:
+        return [a for a in authors if not self.is_done(a)]
+
+    def authors_with_status(self, status: str) -> List[str]:
+        return [a for a, s in self.statuses.items() if s == status]
+
+    # append rows of the author currently being collected
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        write_header = not os.path.exists(self.output_path) or os.path.getsize(self.output_path) == 0
+        with open(self.output_path, "a", encoding="utf-8", newline="") as f:
+            pd.DataFrame(rows, columns=self.columns).to_csv(f, header=write_header, index=False)
+        self._pending_rows += len(rows)
+
+    # rows are the author's last unwritten rows, if any
+    def record(self, author: str, status: str, rows: Optional[List[Dict[str, Any]]] = None):
+        if status == COMPLETED:
+            self.write_rows(rows or [])
+        else:
+            self._pending_rows = 0
+            self._truncate_unrecorded()
+
+        if os.path.exists(self.output_path):
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                os.fsync(f.fileno())
+        self._end_offset = os.path.getsize(self.output_path) if os.path.exists(self.output_path) else 0
+        entry = {
+            "author": author,
+            "status": status,
+            "rows": self._pending_rows,
+            "end_offset": self._end_offset,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.statuses[author] = status
+        self._pending_rows = 0
+
+    def load_rows(self) -> pd.DataFrame:
+        if not os.path.exists(self.output_path) or os.path.getsize(self.output_path) == 0:
+            return pd.DataFrame(columns=self.columns)
+        return pd.read_csv(self.output_path)
+
+    def summary(self) -> Dict[str, int]:
+        counts = {COMPLETED: 0, FAILED: 0, NOT_FOUND: 0}
+        for status in self.statuses.values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
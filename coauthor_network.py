@@ -0,0 +1,68 @@
+from typing import List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+
+# Vectorized coauthor graph construction shared by the analysis scripts. Rows are
+# exploded to one (author, coauthor) pair each, pairs are put in a canonical order and
+# counted with a single groupby, so a (group, year) network is built from deduplicated
+# weighted edge arrays instead of an iterrows loop.
+
+
+def select_rows(df: pd.DataFrame, group: str, paper_year: int,
+                participants: Optional[Set[str]] = None) -> pd.DataFrame:
+    subset = df[(df["group"] == group) & (df["paper_year"] == paper_year)]
+    if participants is not None:
+        subset = subset[subset["author_name"].isin(participants)]
+    return subset
+
+
+# (author, coauthor) pairs, one per coauthor listed on each row
+def author_pairs(subset: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    lists = subset["coauthors"].tolist()
+    counts = np.fromiter((len(c) for c in lists), dtype=np.int64, count=len(lists))
+    authors = np.repeat(subset["author_name"].to_numpy(dtype=object), counts)
+    coauthors = np.empty(int(counts.sum()), dtype=object)
+    coauthors[:] = [name for c in lists for name in c]
+    return authors, coauthors
+
+
+# deduplicated undirected edges: source <= target, weight = number of times the pair
+# appears, in order of first appearance
+def edge_table(authors: np.ndarray, coauthors: np.ndarray) -> pd.DataFrame:
+    swap = authors > coauthors
+    source = np.where(swap, coauthors, authors)
+    target = np.where(swap, authors, coauthors)
+    pairs = pd.DataFrame({"source": source, "target": target})
+    return pairs.groupby(["source", "target"], sort=False).size().reset_index(name="weight")
+
+
+# participants first, then coauthors, each in order of first appearance
+def node_list(subset: pd.DataFrame, coauthors: np.ndarray) -> List[str]:
+    return pd.unique(np.concatenate([subset["author_name"].to_numpy(dtype=object), coauthors])).tolist()
+
+
+def graph_from_edges(nodes: List[str], edges: pd.DataFrame, weighted: bool = False) -> nx.Graph:
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    if weighted:
+        G.add_weighted_edges_from(zip(edges["source"].tolist(), edges["target"].tolist(), edges["weight"].tolist()))
+    else:
+        G.add_edges_from(zip(edges["source"].tolist(), edges["target"].tolist()))
+    return G
+
+
+# returns (G, participants, all_authors) like the scripts' build_one_year_network
+def network_from_rows(subset: pd.DataFrame, weighted: bool = False) -> Tuple[nx.Graph, Set[str], Set[str]]:
+    authors, coauthors = author_pairs(subset)
+    nodes = node_list(subset, coauthors)
+    G = graph_from_edges(nodes, edge_table(authors, coauthors), weighted)
+    participants = set(subset["author_name"].unique())
+    return G, participants, set(nodes)
+
+
+def build_one_year_network(df: pd.DataFrame, group: str, paper_year: int,
+                           sampled_participants: Optional[Set[str]] = None,
+                           weighted: bool = False) -> Tuple[nx.Graph, Set[str], Set[str]]:
+    return network_from_rows(select_rows(df, group, paper_year, sampled_participants), weighted)
@@ -0,0 +1,120 @@
+from typing import List, Dict, Optional, Any, Union
+import ast
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Typed Parquet storage for collector and enrichment output. Coauthors are stored as
+# list<string> and the country / gender counts as map<string, int32>, so readers get
+# real lists and dicts back instead of re-parsing "A, B" and "{'US': 4}" strings.
+
+LIST_COLUMNS = ["coauthors"]
+MAP_COLUMNS = ["coauthor_countries_counts", "coauthor_genders"]
+
+# per-row coauthor counts written by gender_enrichment
+GENDER_COUNT_COLUMNS = ["coauthor_male", "coauthor_female", "coauthor_unknown"]
+
+SCHEMA_FIELDS = {
+    "author_name": pa.string(),
+    "career_stage": pa.string(),
+    "paper_title": pa.string(),
+    "paper_year": pa.int32(),
+    "times_cited": pa.int64(),
+    "total_authors_listed": pa.int32(),
+    "coauthors": pa.list_(pa.string()),
+    "coauthor_count": pa.int32(),
+    "coauthor_countries_counts": pa.map_(pa.string(), pa.int32()),
+    "group": pa.string(),
+    "gender": pa.string(),
+    "coauthor_genders": pa.map_(pa.string(), pa.int32()),
+    "coauthor_male": pa.int32(),
+    "coauthor_female": pa.int32(),
+    "coauthor_unknown": pa.int32(),
+    "work_id": pa.string(),
+    "doi": pa.string(),
+    "author_id": pa.string(),
+}
+
+
+# "A, B" / "['A', 'B']" / list -> list of names, same rules as fix_coauthors
+def parse_name_list(x: Any) -> List[str]:
+    if isinstance(x, (list, tuple)):
+        return [str(n) for n in x]
+    if x is None or (isinstance(x, float) and pd.isna(x)):
+        return []
+    x = str(x).strip("[]")
+    if x == "":
+        return []
+    return [name.strip().strip("'").strip('"') for name in x.split(",")]
+
+
+# "{'US': 4}" / dict -> dict, anything unparseable becomes {}
+def parse_count_map(x: Any) -> Dict[str, int]:
+    if isinstance(x, dict):
+        return {str(k): int(v) for k, v in x.items()}
+    if not isinstance(x, str) or not x.strip():
+        return {}
+    try:
+        parsed = ast.literal_eval(x)
+    except (ValueError, SyntaxError):
+        return {}
+    return {str(k): int(v) for k, v in parsed.items()} if isinstance(parsed, dict) else {}
+
+
+def schema_for(columns: List[str]) -> pa.Schema:
+    return pa.schema([pa.field(c, SCHEMA_FIELDS.get(c, pa.string())) for c in columns])
+
+
+def to_arrow_table(data: Union[pd.DataFrame, List[Dict[str, Any]]]) -> pa.Table:
+    df = pd.DataFrame(data) if not isinstance(data, pd.DataFrame) else data
+    arrays = {}
+    for col in df.columns:
+        values = df[col]
+        if col in LIST_COLUMNS:
+            arrays[col] = [parse_name_list(v) for v in values]
+        elif col in MAP_COLUMNS:
+            arrays[col] = [list(parse_count_map(v).items()) for v in values]
+        else:
+            arrays[col] = values.astype(object).where(values.notna(), None).tolist()
+    schema = schema_for(list(df.columns))
+    return pa.Table.from_pydict(arrays, schema=schema)
+
+
+def write_parquet(data: Union[pd.DataFrame, List[Dict[str, Any]]], path: str):
+    pq.write_table(to_arrow_table(data), path, compression="zstd")
+
+
+# memory-mapped read of the typed table, no string parsing involved
+def read_table(path: str, columns: Optional[List[str]] = None) -> pa.Table:
+    return pq.read_table(path, columns=columns, memory_map=True)
+
+
+# map columns come back as dicts and list columns as lists
+def read_dataset(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    df = read_table(path, columns).to_pandas(maps_as_pydicts="strict")
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(lambda v: list(v) if v is not None else [])
+    for col in MAP_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(lambda v: v if v is not None else {})
+    return df
+
+
+# one-off conversion of a legacy CSV such as Final_Combined.csv
+def csv_to_parquet(csv_path: str, parquet_path: str):
+    write_parquet(pd.read_csv(csv_path), parquet_path)
+
+
+# write collector / enrichment results, picking the format from the file extension;
+# written to a temp file first so a crash mid-write never truncates the existing file
+def save_results(df: pd.DataFrame, path: str):
+    tmp = f"{path}.tmp"
+    if path.endswith(".parquet"):
+        write_parquet(df, tmp)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
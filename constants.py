@@ -0,0 +1,5 @@
+# Study-wide settings shared by the collectors and the analysis modules, kept apart
+# from dataCollect so analysis code doesn't import the HTTP / cache stack.
+
+# publication years collected and analysed, 2017 (pre datathon) to 2023 (post)
+YEARS_OF_INTEREST = set(range(2017, 2024))
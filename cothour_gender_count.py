@@ -1,30 +1,19 @@
 import pandas as pd
-from gender_guesser.detector import Detector
-import re
 
-df = pd.read_csv("Fixed_Treatment.csv")
-
-d = Detector(case_sensitive=False)
-
-def count_coauthor_genders(coauthors_str):
-    if not isinstance(coauthors_str, str) or not coauthors_str.strip():
-        return {'M': 0, 'F': 0}
-
-    coauthors = [c.strip() for c in coauthors_str.split(",") if c.strip()]
-    counts = {'M': 0, 'F': 0}
+from columnar_io import write_parquet
+from gender_enrichment import GenderCache, enrich_genders
 
-    for name in coauthors:
-        first_name = name.split()[0]
-        gender = d.get_gender(first_name)
-
-        if gender in ['male', 'mostly_male']:
-            counts['M'] += 1
-        elif gender in ['female', 'mostly_female']:
-            counts['F'] += 1
-
-    return counts
+df = pd.read_csv("Fixed_Treatment.csv")
 
-df['coauthor_genders'] = df['coauthors'].apply(count_coauthor_genders)
+# each distinct first name goes through gender_guesser once, answers are kept in
+# gender_cache.sqlite for the next run; mostly_male / mostly_female count as M / F
+cache = GenderCache()
+df = enrich_genders(df, cache)
+cache.close()
 
 df.to_csv("Fixed_Treatment.csv", index=False)
-print("Saved with coauthor_genders column")
+print("Saved with coauthor_genders and coauthor_male / coauthor_female / coauthor_unknown columns")
+
+# same data with coauthors as list<string> and the count columns as map<string, int>
+write_parquet(df, "Fixed_Treatment.parquet")
+print("Saved Fixed_Treatment.parquet")
@@ -1,24 +1,63 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, Iterator, Generator, Callable
 from collections import Counter
 import pandas as pd
 import requests
 import re
 import pandas as pd
 from typing import List
+import os
 import time
 import random
+import unicodedata
+from difflib import SequenceMatcher
+
+from checkpoint import COMPLETED, FAILED, NOT_FOUND, CollectionCheckpoint
+from columnar_io import write_parquet
+from constants import YEARS_OF_INTEREST
+from http_cache import ResponseCache, offline_miss
+from rate_limit import get_rate_limiter
+from telemetry import get_telemetry
 
 
 # Configuration
-YEARS_OF_INTEREST = set(range(2017, 2024)) 
+# point OPENALEX_BASE_URL (or set_base_url) at fake_openalex.py for offline runs
+BASE_URL = os.environ.get("OPENALEX_BASE_URL", "https://api.openalex.org").rstrip("/")
+# premium key, needed for filters such as from_updated_date; sent as api_key= but kept
+# out of cache keys and telemetry
+API_KEY = os.environ.get("OPENALEX_API_KEY") or None
+# the deliberate pause between works pages in the sequential collector
+PAGE_PAUSE_SECONDS = (2.5, 3.5)
+
+# the only work fields the row builder reads, used with select= in projected mode
+WORK_FIELDS = ["id", "doi", "title", "publication_year", "cited_by_count", "authorships"]
+
+OUTPUT_COLUMNS = [
+    "author_name", "career_stage", "paper_title", "paper_year", "times_cited",
+    "total_authors_listed", "coauthors", "coauthor_count", "coauthor_countries_counts",
+    # identifiers used to merge incremental refreshes into an existing dataset
+    "work_id", "doi", "author_id"
+]
+
+def set_base_url(url: str):
+    global BASE_URL
+    BASE_URL = url.rstrip("/")
+
+
+def set_api_key(key: Optional[str]):
+    global API_KEY
+    API_KEY = key or None
+
 
 def find_best_author_match(author_name: str) -> Optional[Dict[str, Any]]:
-    base_url = "https://api.openalex.org"
-    r = safe_request(f"{base_url}/authors?filter=display_name.search:{author_name}")
+    r = safe_request(f"{BASE_URL}/authors?filter=display_name.search:{author_name}")
     if r.status_code != 200:
         return None
 
-    results = r.json().get("results", [])
+    return pick_best_match(author_name, r.json().get("results", []))
+
+
+# exact name first, then alternate names, otherwise the top search hit
+def pick_best_match(author_name: str, results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     if not results:
         return None
     target = author_name.lower().strip()
@@ -37,12 +76,126 @@ def find_best_author_match(author_name: str) -> Optional[Dict[str, Any]]:
     
 # for people didnt found we find using frist and last name manually
 def fallback_author_search(author_name: str) -> Optional[Dict[str, Any]]:
-    first, *rest = author_name.split()
+    query = first_last_query(author_name)
+    if not query:
+        return None
+    return find_best_author_match(query)
+
+
+def first_last_query(author_name: str) -> Optional[str]:
+    first, *rest = author_name.split() or [""]
     last = rest[-1] if rest else ""
     if not last:
         return None
-    query = f"{first} {last}" if first else last
-    return find_best_author_match(query)
+    return f"{first} {last}" if first else last
+
+
+# one /authors?search= request per author, the same response is used for matching
+def resolve_author(author_name: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    r = safe_request(f"{BASE_URL}/authors?search={author_name}")
+    if r.status_code != 200:
+        print(f"Error searching for {author_name}: {r.status_code}")
+        return FAILED, None
+    match = pick_best_match(author_name, r.json().get("results", []))
+
+    # a second query only helps when dropping middle names changes it
+    query = first_last_query(author_name)
+    if match is None and query and query != author_name:
+        r = safe_request(f"{BASE_URL}/authors?search={query}")
+        if r.status_code != 200:
+            print(f"Error searching for {query}: {r.status_code}")
+            return FAILED, None
+        match = pick_best_match(query, r.json().get("results", []))
+
+    return (COMPLETED if match else NOT_FOUND), match
+
+
+# lowercase, no accents or punctuation, single spaces
+def normalize_name(name: str) -> str:
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    name = re.sub(r"[^\w\s]", " ", name.lower())
+    return re.sub(r"\s+", " ", name).strip()
+
+
+# 1.0 for an exact display name, 0.95 for an exact alternate name, otherwise fuzzy
+def match_confidence(author_name: str, record: Dict[str, Any]) -> float:
+    target = normalize_name(author_name)
+    display = normalize_name(record.get("display_name") or "")
+    alts = [normalize_name(n) for n in record.get("alternate_names", []) or [] if isinstance(n, str)]
+    if not target:
+        return 0.0
+    if display == target:
+        return 1.0
+    if target in alts:
+        return 0.95
+
+    best = 0.0
+    t = target.split()
+    for cand in [display] + alts:
+        score = SequenceMatcher(None, target, cand).ratio()
+        c = cand.split()
+        # same surname and first initial is a strong hint even with a missing middle name
+        if c and t[-1] == c[-1] and t[0][0] == c[0][0]:
+            score = max(score, 0.85 if t[0] == c[0] else 0.7)
+        best = max(best, score)
+    return round(min(best, 0.9), 3)
+
+
+# resolve many cleaned names with one OR-filter query per batch, returns
+# name -> {"author": record or None, "confidence": score, "status": COMPLETED / NOT_FOUND / FAILED}.
+# A failed request marks the whole batch FAILED so it is retried; names left unmatched
+# when the candidate list was cut off at max_pages go through resolve_author instead
+def resolve_authors_batch(author_names: List[str], batch_size: int = 25, min_confidence: float = 0.7,
+                          max_pages: int = 5) -> Dict[str, Dict[str, Any]]:
+    names = list(dict.fromkeys(n for n in author_names if n))
+    resolved = {}
+
+    for i in range(0, len(names), batch_size):
+        batch = names[i:i + batch_size]
+        # commas and pipes are filter syntax in OpenAlex, they can't be part of a value
+        query = "|".join(re.sub(r"[,|]", " ", n) for n in batch)
+        candidates = []
+        cursor = "*"
+        failed = False
+        for _ in range(max_pages):
+            r = safe_request(f"{BASE_URL}/authors?filter=display_name.search:{query}&per-page=200&cursor={cursor}")
+            if r.status_code != 200:
+                print(f"Error resolving batch starting at {batch[0]}: {r.status_code}")
+                failed = True
+                break
+            data = r.json()
+            results = data.get("results", [])
+            candidates.extend(results)
+            cursor = data.get("meta", {}).get("next_cursor")
+            if not results or not cursor:
+                cursor = None
+                break
+        # more candidates than max_pages could hold
+        truncated = not failed and cursor is not None
+
+        for name in batch:
+            if failed:
+                resolved[name] = {"author": None, "confidence": 0.0, "status": FAILED}
+                continue
+            best, best_score = None, 0.0
+            for rec in candidates:
+                score = match_confidence(name, rec)
+                # ties go to the more prolific profile, like the relevance order of a single search
+                if score > best_score or (best is not None and score == best_score
+                                          and rec.get("works_count", 0) > best.get("works_count", 0)):
+                    best, best_score = rec, score
+            if best_score < min_confidence:
+                best = None
+            if best is None and truncated:
+                status, best = resolve_author(name)
+                best_score = match_confidence(name, best) if best else 0.0
+                resolved[name] = {"author": best, "confidence": best_score, "status": status}
+                continue
+            resolved[name] = {"author": best, "confidence": best_score,
+                              "status": COMPLETED if best else NOT_FOUND}
+
+    return resolved
 
 
 # Return clean list of author names from a string
@@ -53,18 +206,62 @@ def parse_authors(author_string: str) -> List[str]:
     names = [re.sub(r"\s+", " ", p).strip(" .") for p in parts]
     return [n for n in names if n and len(n) > 1]
 
+# persistent response cache shared by every request in the process
+_response_cache: Optional[ResponseCache] = None
+_cache_enabled = True
+
+
+def configure_cache(path: str = "openalex_cache.sqlite", ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                    max_bytes: int = 1024 ** 3, offline: bool = False, enabled: bool = True):
+    global _response_cache, _cache_enabled
+    if _response_cache is not None:
+        _response_cache.close()
+    _cache_enabled = enabled
+    _response_cache = ResponseCache(path, ttl_seconds, max_bytes, offline) if enabled else None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    global _response_cache
+    if _response_cache is None and _cache_enabled:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
 #add delay
-def safe_request(url, max_retries=5):
-    for _ in range(max_retries):
-        r = requests.get(url)
+# use_cache=False always goes to the API (the fresh response still replaces the cached one),
+# for queries whose answer changes between runs such as incremental refreshes
+def safe_request(url, max_retries=5, use_cache=True):
+    telemetry = get_telemetry()
+    cache = get_response_cache()
+    if cache is not None:
+        cached = cache.get(url) if use_cache else None
+        if cached is not None:
+            telemetry.record_cache_hit(url)
+            return cached
+        if cache.offline:
+            return offline_miss()
+
+    limiter = get_rate_limiter()
+    for attempt in range(max_retries):
+        if attempt:
+            telemetry.record_retry(url)
+        limiter.acquire_sync()
+        start = time.perf_counter()
+        r = requests.get(url, params={"api_key": API_KEY} if API_KEY else None)
+        telemetry.record_request(url, r.status_code, time.perf_counter() - start, len(r.content))
         if r.status_code == 200:
+            if cache is not None:
+                cache.put(url, r.status_code, r.content)
             return r
         if r.status_code == 429:
+            # the wait itself is spent (and recorded) in limiter.acquire_sync, other
+            # collectors in the process hold back too
             wait = float(r.headers.get("Retry-After", random.uniform(30, 60)))
-            time.sleep(wait)
+            limiter.block_for(wait)
             continue
         if 500 <= r.status_code < 600:
             wait = random.uniform(5, 10)
+            telemetry.record_sleep("server_error", wait)
             time.sleep(wait)
             continue
         break
@@ -74,44 +271,78 @@ def safe_request(url, max_retries=5):
 # OpenAlex data collection
 
 def collect_papers_one_row_per_paper(author_name: str) -> List[Dict[str, Any]]:
-    base_url = "https://api.openalex.org"
+    return collect_author(author_name)[1]
+
+
+# same as collect_papers_one_row_per_paper, but also reports completed / failed / not_found;
+# pass author_info (e.g. from resolve_authors_batch) to skip the name search.
+# projected=True asks the API for in-window works and WORK_FIELDS only, and takes the
+# career span from a group_by=publication_year aggregate instead of the full history
+def collect_author(author_name: str, author_info: Optional[Dict[str, Any]] = None,
+                   projected: bool = False) -> Tuple[str, List[Dict[str, Any]]]:
     rows = []
+    status = drain_rows(stream_author_rows(author_name, author_info, projected), rows.append)
+    return status, rows
 
-    # Find author by name
-    r = safe_request(f"{base_url}/authors?search={author_name}")
-    if r.status_code != 200:
-        print(f"Error searching for {author_name}: {r.status_code}")
-        return rows
 
-    data = r.json()
-    if not data.get("results"):
-        print(f"No author found for {author_name}")
-        return rows
+# pulls every row out of a stream_author_rows generator into sink, returns the final status
+def drain_rows(stream: Iterator[Dict[str, Any]], sink: Callable[[Dict[str, Any]], Any]) -> str:
+    while True:
+        try:
+            sink(next(stream))
+        except StopIteration as stop:
+            return stop.value
+
+
+# generator version of collect_author: rows are yielded as pages arrive and each page
+# is dropped once processed; the generator's return value is the author status
+def stream_author_rows(author_name: str, author_info: Optional[Dict[str, Any]] = None,
+                       projected: bool = False) -> Generator[Dict[str, Any], None, str]:
+    start = time.perf_counter()
+    stats = {"pages": 0}
+    status = yield from _stream_author_rows(author_name, author_info, projected, stats)
+    get_telemetry().record_author(status, stats["pages"], time.perf_counter() - start)
+    return status
 
-    author_info = find_best_author_match(author_name)
-    if not author_info:
-        # try fallback
-        author_info = fallback_author_search(author_name)
-        if not author_info:
-            print(f"No author found for {author_name}")
-            return rows
+
+def _stream_author_rows(author_name: str, author_info: Optional[Dict[str, Any]], projected: bool,
+                        stats: Dict[str, int]) -> Generator[Dict[str, Any], None, str]:
+    # Find author by name
+    if author_info is None:
+        status, author_info = resolve_author(author_name)
+        if status != COMPLETED:
+            if status == NOT_FOUND:
+                print(f"No author found for {author_name}")
+            return status
 
     author_id = author_info["id"]
     display_name = author_info["display_name"]
     print(f"Found OpenAlex author for {author_name}: {display_name}")
 
+    year_bounds = None
+    if projected:
+        status, year_bounds = fetch_career_years(author_id)
+        if status != COMPLETED:
+            print(f"Error fetching publication years for {author_name}")
+            return status
+        if year_bounds is None:
+            return COMPLETED
+
     # get all works
-    works_url = f"{base_url}/works?filter=author.id:{author_id}&per-page=200"
+    works_url = build_works_url(author_id, projected)
     #this only gives journal article
     cursor = "*"
-    all_works = []
+    fetched = 0
+    acc = AuthorRowAccumulator(display_name, year_bounds, author_id)
 
     while True:
         url = f"{works_url}&cursor={cursor}"
         r = safe_request(url)
         if r.status_code != 200:
             print(f"Error fetching works for {author_name}: {r.status_code}")
-            break
+            # partial rows still go out, checkpointed runs discard them for failed authors
+            yield from acc.finish()
+            return FAILED
 
         data = r.json()
         works = data.get("results", [])
@@ -120,90 +351,196 @@ def collect_papers_one_row_per_paper(author_name: str) -> List[Dict[str, Any]]:
         if not works:
             break
 
-        all_works.extend(works)
-        print(f"Fetched {len(all_works)} / {meta.get('count', '?')} works so far for {display_name}")
+        fetched += len(works)
+        stats["pages"] += 1
+        print(f"Fetched {fetched} / {meta.get('count', '?')} works so far for {display_name}")
+        yield from acc.add_page(works)
+        del data, works
 
         # check if there’s a next page
         cursor = meta.get("next_cursor")
         if not cursor:
-            print(f"Completed fetching all {len(all_works)} works for {display_name}")
+            print(f"Completed fetching all {fetched} works for {display_name}")
             break
         
-        time.sleep(random.uniform(2.5, 3.5))
+        # cached pages cost no API quota, so only pause after a real request
+        if not getattr(r, "from_cache", False):
+            pause = random.uniform(*PAGE_PAUSE_SECONDS)
+            get_telemetry().record_sleep("page_pause", pause)
+            time.sleep(pause)
 
-        
-        
-    unique_works = {}
-    for w in all_works:
-        doi = w.get("doi") or w.get("id")
-        if doi not in unique_works:
-            unique_works[doi] = w
-    all_works = list(unique_works.values())
-        
-    #get career stage estimate
-    pub_years = [w.get("publication_year") for w in all_works if w.get("publication_year")]
-    if not pub_years:
-        #print(f"No publication pub_years found for {display_name}")
-        return []
+    yield from acc.finish()
+    return COMPLETED
+
+
+def build_works_url(author_id: str, projected: bool = False) -> str:
+    if not projected:
+        return f"{BASE_URL}/works?filter=author.id:{author_id}&per-page=200"
+    years = f"publication_year:{min(YEARS_OF_INTEREST)}-{max(YEARS_OF_INTEREST)}"
+    return f"{BASE_URL}/works?filter=author.id:{author_id},{years}&select={','.join(WORK_FIELDS)}&per-page=200"
+
+
+# (first_year, last_year) of an author's whole career from one aggregate request
+def fetch_career_years(author_id: str, use_cache: bool = True) -> Tuple[str, Optional[Tuple[int, int]]]:
+    r = safe_request(f"{BASE_URL}/works?filter=author.id:{author_id}&group_by=publication_year", use_cache=use_cache)
+    if r.status_code != 200:
+        return FAILED, None
+    return COMPLETED, career_years_from_groups(r.json().get("group_by", []))
+
+
+def career_years_from_groups(groups: List[Dict[str, Any]]) -> Optional[Tuple[int, int]]:
+    # keys are year strings, works without a year come back as "unknown"
+    years = [int(g["key"]) for g in groups if str(g.get("key", "")).isdigit() and g.get("count")]
+    if not years:
+        return None
+    return min(years), max(years)
+
+
+# dedupe works by DOI, estimate career stage and build one row per paper; year_bounds
+# overrides the career span when works only cover the years of interest
+def build_author_rows(all_works: List[Dict[str, Any]], display_name: str,
+                      year_bounds: Optional[Tuple[int, int]] = None,
+                      author_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    acc = AuthorRowAccumulator(display_name, year_bounds, author_id)
+    return acc.add_page(all_works) + acc.finish()
+
+
+# keeps only what build_paper_row reads from a work
+def compact_work(w: Dict[str, Any]) -> Dict[str, Any]:
+    authorships = []
+    for a in w.get("authorships", []):
+        author = a.get("author")
+        institutions = a.get("institutions", [])
+        authorships.append({
+            "author": {"id": author.get("id"), "display_name": author.get("display_name")} if author else None,
+            "institutions": [{"country_code": institutions[0].get("country_code")}] if institutions else [],
+        })
+    return {
+        "id": w.get("id"),
+        "doi": w.get("doi"),
+        "title": w.get("title"),
+        "publication_year": w.get("publication_year"),
+        "cited_by_count": w.get("cited_by_count"),
+        "authorships": authorships,
+    }
+
+
+# running state for one author's works stream: DOI dedup, first/last year and, until
+# the career stage is known, compact copies of the in-window papers
+class AuthorRowAccumulator:
+    def __init__(self, display_name: str, year_bounds: Optional[Tuple[int, int]] = None,
+                 author_id: Optional[str] = None):
+        self.display_name = display_name
+        self.author_id = author_id
+        self.seen = set()
+        self.first_year = None
+        self.last_year = None
+        self.pending = []
+        self.career_stage = None
+        if year_bounds is not None:
+            self.first_year, self.last_year = year_bounds
+            self._set_stage()
+
+    def _set_stage(self):
+        self.career_stage = estimate_career_stage(self.first_year, self.last_year)
+        print(f"{self.display_name}: first year {self.first_year}, last year {self.last_year}, stage {self.career_stage}")
+
+    def add_page(self, works: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rows = []
+        for w in works:
+            doi = w.get("doi") or w.get("id")
+            if doi in self.seen:
+                continue
+            self.seen.add(doi)
+
+            year = w.get("publication_year")
+            if self.career_stage is not None:
+                row = build_paper_row(w, self.display_name, self.career_stage, self.author_id)
+                if row is not None:
+                    rows.append(row)
+                continue
+
+            if year:
+                self.first_year = year if self.first_year is None else min(self.first_year, year)
+                self.last_year = year if self.last_year is None else max(self.last_year, year)
+            if year in YEARS_OF_INTEREST:
+                self.pending.append(compact_work(w))
+        return rows
 
-    first_year = min(pub_years)
-    last_year = max(pub_years)
+    def finish(self) -> List[Dict[str, Any]]:
+        if self.career_stage is None:
+            if self.first_year is None:
+                #print(f"No publication pub_years found for {self.display_name}")
+                return []
+            self._set_stage()
+
+        rows = []
+        for w in self.pending:
+            row = build_paper_row(w, self.display_name, self.career_stage, self.author_id)
+            if row is not None:
+                rows.append(row)
+        self.pending = []
+        return rows
+
+
+def estimate_career_stage(first_year: int, last_year: int) -> str:
     career_length = last_year - first_year + 1
 
     if career_length <= 5:
-        career_stage = "Early-career"
+        return "Early-career"
     elif career_length <= 15:
-        career_stage = "Mid-career"
-    else:
-        career_stage = "Senior"
-    print(f"{display_name}: first year {first_year}, last year {last_year}, stage {career_stage}")
+        return "Mid-career"
+    return "Senior"
 
-        
-    for w in all_works:
-        year = w.get("publication_year")
-        if year not in YEARS_OF_INTEREST:
-            continue
 
-        title = w.get("title")
-        if title and re.search(r"(list of contributors|editorial board|erratum|acknowledgement|treatment)", title, re.IGNORECASE):
-            continue
-        cited_by_count = w.get("cited_by_count")
-        authorships = w.get("authorships", [])
-
-        # Extract all authors
-        authors = [a["author"]["display_name"] for a in authorships if a.get("author")]
-        total_authors_listed = len(authors)
-
-        # Coauthors 
-        coauthors = []
-        for a in authors:
-            if a is not None and (a.lower() != display_name.lower()):
-                coauthors += [a]
-
-        coauthor_count = len(coauthors)
-
-        # Count coauthors by country 
-        countries = []
-        for a in authorships:
-            institutions = a.get("institutions", [])
-            country = institutions[0].get("country_code") if institutions else None
-            if country:
-                countries.append(country)
-        coauthor_countries_counts = dict(Counter(countries))
-
-        rows.append({
-            "author_name": display_name,
-            "career_stage": career_stage,
-            "paper_title": title,
-            "paper_year": year,
-            "times_cited": cited_by_count,
-            "total_authors_listed": total_authors_listed,
-            "coauthors": ", ".join(coauthors),
-            "coauthor_count": coauthor_count,
-            "coauthor_countries_counts": coauthor_countries_counts
-        })
+# one output row for a work, or None if it is outside the years of interest or not a real paper
+def build_paper_row(w: Dict[str, Any], display_name: str, career_stage: str,
+                    author_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    year = w.get("publication_year")
+    if year not in YEARS_OF_INTEREST:
+        return None
 
-    return rows
+    title = w.get("title")
+    if title and re.search(r"(list of contributors|editorial board|erratum|acknowledgement|treatment)", title, re.IGNORECASE):
+        return None
+    cited_by_count = w.get("cited_by_count")
+    authorships = w.get("authorships", [])
+
+    # Extract all authors
+    authors = [a["author"]["display_name"] for a in authorships if a.get("author")]
+    total_authors_listed = len(authors)
+
+    # Coauthors 
+    coauthors = []
+    for a in authors:
+        if a is not None and (a.lower() != display_name.lower()):
+            coauthors += [a]
+
+    coauthor_count = len(coauthors)
+
+    # Count coauthors by country 
+    countries = []
+    for a in authorships:
+        institutions = a.get("institutions", [])
+        country = institutions[0].get("country_code") if institutions else None
+        if country:
+            countries.append(country)
+    coauthor_countries_counts = dict(Counter(countries))
+
+    return {
+        "author_name": display_name,
+        "career_stage": career_stage,
+        "paper_title": title,
+        "paper_year": year,
+        "times_cited": cited_by_count,
+        "total_authors_listed": total_authors_listed,
+        "coauthors": ", ".join(coauthors),
+        "coauthor_count": coauthor_count,
+        "coauthor_countries_counts": coauthor_countries_counts,
+        "work_id": w.get("id"),
+        "doi": w.get("doi"),
+        "author_id": author_id
+    }
 
 #remove all titles
 def clean_author_name(name: str) -> str:
@@ -227,16 +564,45 @@ def clean_author_name(name: str) -> str:
 
 
 
-def collect_for_authors_one_row(author_names: List[str]) -> pd.DataFrame:
-    all_rows = []
-    for raw_name in author_names:
-        name = clean_author_name(raw_name)
-        all_rows.extend(collect_papers_one_row_per_paper(name))
-    cols = [
-        "author_name", "career_stage", "paper_title", "paper_year", "times_cited",
-        "total_authors_listed", "coauthors", "coauthor_count", "coauthor_countries_counts"
-    ]
-    return pd.DataFrame(all_rows, columns=cols)
+# telemetry_path: where to dump the run's request / sleep / page metrics as JSON
+def collect_for_authors_one_row(author_names: List[str], checkpoint_path: Optional[str] = None,
+                                projected: bool = False, telemetry_path: Optional[str] = None) -> pd.DataFrame:
+    if checkpoint_path:
+        df = collect_with_checkpoint(author_names, checkpoint_path, projected)
+    else:
+        all_rows = []
+        for raw_name in author_names:
+            name = clean_author_name(raw_name)
+            all_rows.extend(collect_author(name, projected=projected)[1])
+        df = pd.DataFrame(all_rows, columns=OUTPUT_COLUMNS)
+
+    if telemetry_path:
+        get_telemetry().dump(telemetry_path)
+    return df
+
+
+# appends each author's rows to checkpoint_path as soon as it finishes; rerunning
+# with the same path skips completed authors and retries the failed ones
+def collect_with_checkpoint(author_names: List[str], checkpoint_path: str, projected: bool = False) -> pd.DataFrame:
+    checkpoint = CollectionCheckpoint(checkpoint_path, columns=OUTPUT_COLUMNS)
+    pending = checkpoint.pending(author_names)
+    print(f"{len(author_names) - len(pending)} authors already done, {len(pending)} to collect")
+
+    for raw_name in pending:
+        # rows reach the output file in small batches while the author is still paging
+        buffer = []
+
+        def sink(row):
+            buffer.append(row)
+            if len(buffer) >= 500:
+                checkpoint.write_rows(buffer)
+                buffer.clear()
+
+        status = drain_rows(stream_author_rows(clean_author_name(raw_name), projected=projected), sink)
+        checkpoint.record(raw_name, status, buffer)
+
+    print(f"Checkpoint summary: {checkpoint.summary()}")
+    return checkpoint.load_rows()
 
 #def collect_for_authors_from_csv(csv_path: str, author_column: str) -> pd.DataFrame:
  #   df_authors = pd.read_csv(csv_path)
@@ -265,15 +631,21 @@ def collect_random_sample_from_csv(csv_path: str, author_column: str, sample_siz
 #print("Saved results to openalex_sample_88_authors.csv")
 
 
-def collect_from_csv(csv_path: str, author_column: str) -> pd.DataFrame:
+def collect_from_csv(csv_path: str, author_column: str, checkpoint_path: Optional[str] = None,
+                     projected: bool = False, telemetry_path: Optional[str] = None) -> pd.DataFrame:
     df_authors = pd.read_csv(csv_path)
     author_names = df_authors[author_column].dropna().unique().tolist()
-    return collect_for_authors_one_row(author_names)
+    return collect_for_authors_one_row(author_names, checkpoint_path, projected, telemetry_path)
 
 #df = collect_from_csv("combined.csv", "author_name")
 #df.to_csv("combined_new.csv", index=False)
 #print("Saved results to combined_new.csv")
 
-df = collect_from_csv("missing.csv", "Full Name")
-df.to_csv("missing.csv", index=False)
-print("Saved results to newmissing.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    # rows are checkpointed into newmissing.csv, the input missing.csv is never overwritten
+    df = collect_from_csv("missing.csv", "Full Name", checkpoint_path="newmissing.csv",
+                          telemetry_path="newmissing.telemetry.json")
+    print("Saved results to newmissing.csv")
+    # typed copy with real list / map columns for the analysis scripts
+    write_parquet(df, "newmissing.parquet")
+    print("Saved results to newmissing.parquet")
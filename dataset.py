@@ -0,0 +1,114 @@
+from typing import List, Dict, Optional, Any
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from columnar_io import LIST_COLUMNS, MAP_COLUMNS, parse_count_map, parse_name_list, read_dataset, write_parquet
+
+
+# Shared loader for the analysis scripts. Final_Combined.csv is parsed once (coauthors
+# to lists, country / gender counts to dicts) and cached next to it as typed Parquet;
+# later runs read the cache directly. The cache is rebuilt when the source changes:
+# size + mtime are checked first and the sha256 only when those differ, so touching
+# the CSV without editing it doesn't force a re-parse.
+#
+#   from dataset import load_combined
+#   df = load_combined()
+
+DEFAULT_DATASET = "Final_Combined.csv"
+
+# bump when the parsing rules change so old caches are rebuilt
+CACHE_VERSION = 1
+
+
+def cache_paths(source_path: str) -> Dict[str, str]:
+    base, _ = os.path.splitext(source_path)
+    return {"data": f"{base}.cache.parquet", "meta": f"{base}.cache.json"}
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_fingerprint(path: str, sha256: Optional[str] = None) -> Dict[str, Any]:
+    st = os.stat(path)
+    return {"version": CACHE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "sha256": sha256 or file_sha256(path)}
+
+
+def load_meta(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_meta(meta: Dict[str, Any], path: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, path)
+
+
+# True when the cached Parquet still matches the source file
+def cache_is_fresh(source_path: str, paths: Dict[str, str]) -> bool:
+    meta = load_meta(paths["meta"])
+    if meta is None or meta.get("version") != CACHE_VERSION or not os.path.exists(paths["data"]):
+        return False
+    st = os.stat(source_path)
+    if meta.get("size") == st.st_size and meta.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    if meta.get("size") != st.st_size:
+        return False
+    # same size but a new mtime: only a content change invalidates the cache
+    sha256 = file_sha256(source_path)
+    if sha256 != meta.get("sha256"):
+        return False
+    save_meta(source_fingerprint(source_path, sha256), paths["meta"])
+    return True
+
+
+def build_cache(source_path: str, paths: Dict[str, str]):
+    df = pd.read_csv(source_path)
+    tmp = f"{paths['data']}.tmp"
+    write_parquet(df, tmp)
+    os.replace(tmp, paths["data"])
+    save_meta(source_fingerprint(source_path), paths["meta"])
+
+
+# coauthors as lists of names, coauthor_countries_counts / coauthor_genders as dicts
+def load_combined(path: str = DEFAULT_DATASET, columns: Optional[List[str]] = None,
+                  use_cache: bool = True) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return read_dataset(path, columns)
+    paths = cache_paths(path)
+    if use_cache:
+        try:
+            if not cache_is_fresh(path, paths):
+                build_cache(path, paths)
+            return read_dataset(paths["data"], columns)
+        except OSError as e:
+            # read-only checkout or similar, parse the CSV without caching
+            print(f"Dataset cache unavailable ({e}), reading {path} directly")
+    df = read_dataset_from_csv(path)
+    return df[columns] if columns else df
+
+
+def read_dataset_from_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(parse_name_list)
+    for col in MAP_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(parse_count_map)
+    return df
@@ -0,0 +1,100 @@
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from dataset import load_combined
+from graph_index import GraphIndex
+
+
+# Per-participant ego-network statistics for whole cohorts at once. Each (group, year)
+# graph's participant rows are lifted to a names x names sparse matrix over the interned
+# ids (row = participant, column = coauthor, value = tie weight), so degree and tie
+# strength are row reductions and new / retained / lost coauthors between two years
+# are row counts of the elementwise product of two such matrices.
+#
+#   ego_change(index, "treatment", before=2017, after=2023)
+
+
+# participant code -> coauthor code tie weights for one cohort-year, self-ties dropped
+def ego_matrix(index: GraphIndex, group: str, year: int) -> sp.csr_matrix:
+    graph = index.graph(group, year, weighted=True)
+    n_names = len(index.rows.index)
+    rows = graph.adjacency[graph.participant_mask].tocoo()
+    codes = graph.node_codes
+    participants = codes[graph.participant_mask]
+    src, dst = participants[rows.row], codes[rows.col]
+    keep = src != dst
+    return sp.csr_matrix((rows.data[keep], (src[keep], dst[keep])), shape=(n_names, n_names))
+
+
+def ego_stats(index: GraphIndex, group: str, year: int) -> pd.DataFrame:
+    M = ego_matrix(index, group, year)
+    participants = np.unique(index.rows.authors[index.positions(group, year)])
+    sub = M[participants]
+    degree = np.diff(sub.indptr)
+    strength = np.asarray(sub.sum(axis=1)).ravel()
+    repeat = np.asarray((sub > 1).sum(axis=1)).ravel()
+    papers = np.bincount(index.rows.authors[index.positions(group, year)], minlength=len(index.rows.index))
+    return pd.DataFrame({
+        "group": group,
+        "year": year,
+        "author_name": index.rows.index.decode(participants),
+        "papers": papers[participants],
+        # unique coauthors in the cohort-year graph, not counting a self-tie
+        "degree": degree,
+        "tie_strength_total": strength,
+        "tie_strength_mean": np.divide(strength, degree, out=np.zeros(len(degree)), where=degree > 0),
+        "tie_strength_max": sub.max(axis=1).toarray().ravel() if sub.shape[0] else np.zeros(0),
+        "repeat_coauthors": repeat,
+    })
+
+
+# one row per participant active in either year: coauthors kept, gained and dropped
+def ego_change(index: GraphIndex, group: str, before: int = 2017, after: int = 2023) -> pd.DataFrame:
+    A = ego_matrix(index, group, before)
+    B = ego_matrix(index, group, after)
+    authors_a = index.rows.authors[index.positions(group, before)]
+    authors_b = index.rows.authors[index.positions(group, after)]
+    participants = np.union1d(authors_a, authors_b)
+    A, B = A[participants], B[participants]
+    deg_a = np.diff(A.indptr)
+    deg_b = np.diff(B.indptr)
+    shared = A.multiply(B)
+    retained = shared.getnnz(axis=1)
+    union = deg_a + deg_b - retained
+    strength_a = np.asarray(A.sum(axis=1)).ravel()
+    strength_b = np.asarray(B.sum(axis=1)).ravel()
+    # tie weight after the event on the coauthors that were kept
+    retained_strength = np.asarray((B.multiply(A > 0)).sum(axis=1)).ravel()
+    return pd.DataFrame({
+        "group": group,
+        "author_name": index.rows.index.decode(participants),
+        f"active_{before}": np.isin(participants, authors_a),
+        f"active_{after}": np.isin(participants, authors_b),
+        f"degree_{before}": deg_a,
+        f"degree_{after}": deg_b,
+        "retained_coauthors": retained,
+        "new_coauthors": deg_b - retained,
+        "lost_coauthors": deg_a - retained,
+        "jaccard": np.divide(retained, union, out=np.zeros(len(union)), where=union > 0),
+        f"tie_strength_{before}": strength_a,
+        f"tie_strength_{after}": strength_b,
+        "retained_tie_strength": retained_strength,
+    })
+
+
+# ego_change for every cohort, in one tidy frame
+def ego_change_table(index: GraphIndex, before: int = 2017, after: int = 2023,
+                     groups: Optional[List[str]] = None) -> pd.DataFrame:
+    return pd.concat([ego_change(index, group, before, after) for group in groups or index.groups],
+                     ignore_index=True)
+
+
+if __name__ == "__main__":
+    index = GraphIndex(load_combined())
+    table = ego_change_table(index)
+    table.to_csv("participant_ego_change.csv", index=False)
+    print("Saved participant_ego_change.csv")
+    print(table.groupby("group")[["degree_2017", "degree_2023", "retained_coauthors", "new_coauthors",
+                                  "lost_coauthors", "jaccard"]].mean().to_string())
@@ -0,0 +1,294 @@
+from typing import List, Dict, Optional, Any
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import argparse
+import json
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+from batch_collect import short_id
+from dataCollect import normalize_name
+
+
+# Local stand-in for the parts of the OpenAlex API the collectors use:
+#   /authors?search=NAME and /authors?filter=display_name.search:A|B
+#   /works?filter=author.id:A|B[,publication_year:Y1-Y2][&select=..][&group_by=publication_year]
+# with cursor pagination. Responses are served from a fixture of author and work
+# records, recorded from the response cache or generated, and the server can add
+# latency, 429 bursts with Retry-After and random 5xx errors.
+
+
+class FaultConfig:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, burst_every: int = 0,
+                 burst_length: int = 0, retry_after: float = 1.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        # every burst_every-th request starts a run of burst_length 429 responses
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+
+
+class FakeOpenAlex:
+    def __init__(self, fixture: Dict[str, List[Dict[str, Any]]], faults: Optional[FaultConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.authors = fixture.get("authors", [])
+        self.works = fixture.get("works", [])
+        self.faults = faults or FaultConfig()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._burst_left = 0
+        self.request_log: List[str] = []
+
+        # author id -> works, so author.id filters don't scan every work
+        self._works_by_author: Dict[str, List[Dict[str, Any]]] = {}
+        for w in self.works:
+            for a in w.get("authorships", []):
+                author_id = short_id((a.get("author") or {}).get("id", ""))
+                if author_id:
+                    self._works_by_author.setdefault(author_id, []).append(w)
+
+        handler = type("Handler", (_Handler,), {"api": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOpenAlex":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # returns (status, headers, body) for one request after the fault model has run
+    def handle(self, path_qs: str):
+        with self._lock:
+            self._requests += 1
+            self.request_log.append(path_qs)
+            faults = self.faults
+            if faults.burst_every and self._requests % faults.burst_every == 0:
+                self._burst_left = faults.burst_length
+            throttled = self._burst_left > 0
+            if throttled:
+                self._burst_left -= 1
+            server_error = not throttled and faults.rng.random() < faults.error_rate
+            delay = faults.latency + faults.rng.uniform(0, faults.jitter)
+
+        if delay > 0:
+            time.sleep(delay)
+        if throttled:
+            return 429, {"Retry-After": str(faults.retry_after)}, {"error": "rate limited"}
+        if server_error:
+            return 503, {}, {"error": "injected server error"}
+
+        parsed = urlparse(path_qs)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        if parsed.path.rstrip("/") == "/authors":
+            return 200, {}, self._authors(query)
+        if parsed.path.rstrip("/") == "/works":
+            return 200, {}, self._works(query)
+        return 404, {}, {"error": "not found"}
+
+    def _authors(self, query: Dict[str, str]) -> Dict[str, Any]:
+        filters = parse_filters(query.get("filter", ""))
+        if "search" in query:
+            terms = [query["search"]]
+        elif "display_name.search" in filters:
+            terms = filters["display_name.search"].split("|")
+        else:
+            terms = []
+
+        matches = []
+        for rec in self.authors:
+            names = [normalize_name(rec.get("display_name", ""))]
+            names += [normalize_name(n) for n in rec.get("alternate_names", []) or []]
+            for term in terms:
+                tokens = normalize_name(term).split()
+                if tokens and any(all(t in n.split() for t in tokens) for n in names):
+                    matches.append(rec)
+                    break
+        matches.sort(key=lambda r: -r.get("works_count", 0))
+        return paginate(matches, query)
+
+    def _works(self, query: Dict[str, str]) -> Dict[str, Any]:
+        filters = parse_filters(query.get("filter", ""))
+        selected: Dict[str, Dict[str, Any]] = {}
+        for author_id in filters.get("author.id", "").split("|"):
+            for w in self._works_by_author.get(short_id(author_id), []):
+                selected[w["id"]] = w
+        works = list(selected.values())
+
+        if "publication_year" in filters:
+            low, _, high = filters["publication_year"].partition("-")
+            low, high = int(low), int(high or low)
+            works = [w for w in works if w.get("publication_year") and low <= w["publication_year"] <= high]
+        for date_filter, field in (("from_updated_date", "updated_date"), ("from_created_date", "created_date")):
+            if date_filter in filters:
+                works = [w for w in works if (w.get(field) or "") >= filters[date_filter]]
+
+        if query.get("group_by") == "publication_year":
+            counts: Dict[str, int] = {}
+            for w in works:
+                key = str(w.get("publication_year") or "unknown")
+                counts[key] = counts.get(key, 0) + 1
+            groups = [{"key": k, "key_display_name": k, "count": n} for k, n in sorted(counts.items())]
+            return {"meta": {"count": len(works), "groups_count": len(groups)}, "results": [], "group_by": groups}
+
+        if "select" in query:
+            fields = query["select"].split(",")
+            works = [{f: w.get(f) for f in fields} for w in works]
+        return paginate(works, query)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    api: FakeOpenAlex = None
+
+    def do_GET(self):
+        status, headers, body = self.api.handle(self.path)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# "author.id:A|B,publication_year:2017-2023" -> {"author.id": "A|B", ...}
+def parse_filters(filter_str: str) -> Dict[str, str]:
+    filters = {}
+    for part in filter_str.split(","):
+        key, sep, value = part.partition(":")
+        if sep:
+            filters[key.strip()] = value.strip()
+    return filters
+
+
+# cursor is the plain offset of the next page, "*" for the first one
+def paginate(items: List[Dict[str, Any]], query: Dict[str, str]) -> Dict[str, Any]:
+    per_page = min(int(query.get("per-page", query.get("per_page", 25))), 200)
+    cursor = query.get("cursor")
+    offset = 0 if cursor in (None, "*") else int(cursor)
+    page = items[offset:offset + per_page]
+    next_offset = offset + per_page
+    next_cursor = str(next_offset) if cursor is not None and next_offset < len(items) else None
+    return {
+        "meta": {"count": len(items), "per_page": per_page, "next_cursor": next_cursor},
+        "results": page,
+    }
+
+
+# fixture from the responses recorded in an http_cache SQLite file
+def fixture_from_cache(cache_path: str) -> Dict[str, List[Dict[str, Any]]]:
+    authors: Dict[str, Dict[str, Any]] = {}
+    works: Dict[str, Dict[str, Any]] = {}
+    conn = sqlite3.connect(cache_path)
+    try:
+        for url, body in conn.execute("SELECT url, body FROM responses"):
+            data = json.loads(zlib.decompress(body))
+            path = urlparse(url).path.rstrip("/")
+            target = authors if path.endswith("/authors") else works if path.endswith("/works") else None
+            if target is None:
+                continue
+            for rec in data.get("results", []):
+                # a full record wins over a select= projection of the same work
+                if rec.get("id") and len(rec) >= len(target.get(rec["id"], {})):
+                    target[rec["id"]] = rec
+    finally:
+        conn.close()
+    return {"authors": list(authors.values()), "works": list(works.values())}
+
+
+FIRST_NAMES = ["Maria", "James", "Wei", "Aisha", "Carlos", "Emma", "Raj", "Olga", "Kenji", "Fatima",
+               "Lucas", "Sara", "Ahmed", "Julia", "Tom", "Nadia", "Pierre", "Mei", "Ivan", "Grace"]
+LAST_NAMES = ["Garcia", "Smith", "Zhang", "Khan", "Silva", "Brown", "Patel", "Ivanova", "Sato", "Haddad",
+              "Martin", "Rossi", "Hassan", "Novak", "Lee", "Kowalski", "Dubois", "Chen", "Petrov", "Okafor"]
+
+
+# synthetic fixture for load tests: n_authors tracked authors with a spread of career
+# lengths and works_per_author works each, sharing a pool of coauthors
+def synthetic_fixture(n_authors: int = 100, works_per_author: int = 40, coauthor_pool: int = 2000,
+                      seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    authors = []
+    for i in range(n_authors):
+        name = f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]} {i}"
+        authors.append({"id": f"https://openalex.org/A{i + 1}", "display_name": name,
+                        "alternate_names": [], "works_count": works_per_author})
+    pool = [{"id": f"https://openalex.org/A{100000 + j}",
+             "display_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"} for j in range(coauthor_pool)]
+    countries = ["US", "GB", "CN", "DE", "BR", "IN", "FR", "JP"]
+
+    works = []
+    for i, author in enumerate(authors):
+        first_year = rng.randint(1990, 2021)
+        for k in range(works_per_author):
+            year = rng.randint(first_year, 2024)
+            members = [author] + rng.sample(pool, rng.randint(1, 8))
+            works.append({
+                "id": f"https://openalex.org/W{i * works_per_author + k + 1}",
+                "doi": f"https://doi.org/10.5555/{i}.{k}",
+                "title": f"Synthetic paper {i}.{k}",
+                "publication_year": year,
+                "cited_by_count": rng.randint(0, 200),
+                "created_date": f"{year}-01-15",
+                "updated_date": f"{min(year + 1, 2024)}-06-01",
+                "abstract_inverted_index": {"synthetic": [0], "abstract": [1]},
+                "authorships": [
+                    {"author": {"id": m["id"], "display_name": m["display_name"]},
+                     "institutions": [{"country_code": rng.choice(countries)}]}
+                    for m in members
+                ],
+            })
+    return {"authors": authors, "works": works}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAlex API from a fixture")
+    parser.add_argument("--fixture", help="JSON fixture with authors and works")
+    parser.add_argument("--from-cache", help="build the fixture from an http_cache SQLite file")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--burst-every", type=int, default=0)
+    parser.add_argument("--burst-length", type=int, default=0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.from_cache:
+        fixture = fixture_from_cache(args.from_cache)
+    elif args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            fixture = json.load(f)
+    else:
+        fixture = synthetic_fixture()
+
+    faults = FaultConfig(args.latency, args.jitter, args.burst_every, args.burst_length,
+                         args.retry_after, args.error_rate)
+    api = FakeOpenAlex(fixture, faults, port=args.port)
+    print(f"Fake OpenAlex on {api.base_url} ({len(fixture['authors'])} authors, {len(fixture['works'])} works)")
+    print(f"Run collectors with OPENALEX_BASE_URL={api.base_url}")
+    api.server.serve_forever()
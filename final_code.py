@@ -1,121 +1,40 @@
-import pandas as pd
 import networkx as nx
-import matplotlib.pyplot as plt
 from collections import defaultdict
 
-df = pd.read_csv("Final_Combined.csv")
-
-
-def fix_coauthors(x):
-    if pd.isna(x): 
-        return []
-    # Remove brackets and split
-    x = x.strip("[]")
-    if x == "":
-        return []
-    return [name.strip().strip("'").strip('"') for name in x.split(",")]
-
-df["coauthors"] = df["coauthors"].apply(fix_coauthors)
-
-
-
-def build_one_year_network(df, group, paper_year):
-    
-    subset = df[(df["group"] == group) & (df["paper_year"] == paper_year)]
-    
-    participants = set(subset["author_name"].unique())
-    
-    edges = []
-    all_authors = set()
-    
-    for _, row in subset.iterrows():
-        author = row["author_name"]
-        coauthors = row["coauthors"]
-        
-        all_authors.add(author)
-        all_authors.update(coauthors)
-        
-        for co in coauthors:
-            edges.append((author, co))
-    
-    # Build graph
-    G = nx.Graph()
-    G.add_nodes_from(all_authors)
-    G.add_edges_from(edges)
-    
-    return G, participants, all_authors
-
-
-def plot_network(G, participants, title, filename):
-    plt.figure(figsize=(14, 12))
-
-    # increase spacing between nodes with higher k
-    pos = nx.spring_layout(G, seed=42, k=0.6, iterations=200)
-
-    # add color participants vs others
-    color_map = ['red' if node in participants else 'lightblue' for node in G.nodes()]
-
-    # node size = degree coauthors so important nodes stand out
-    degree_dict = dict(G.degree())
-    node_sizes = [max(degree_dict[n] * 50, 80) for n in G.nodes()]  # minimum size 80
-
-    # draw nodes and edges more cleanly
-    nx.draw_networkx_nodes(G, pos, 
-                           node_color=color_map, 
-                           node_size=node_sizes, 
-                           alpha=0.85)
-
-    nx.draw_networkx_edges(G, pos, 
-                           alpha=0.15, 
-                           width=0.5)
-
-
-    labels = {node: node for node in G.nodes() if node in participants} 
-    nx.draw_networkx_labels(G, pos, labels, font_size=6)
-
-    plt.title(title, fontsize=16)
-    plt.axis("off")
-    plt.tight_layout()
-    plt.savefig(filename, format="jpg", dpi=300)
-    plt.close()
-
-    print(f"Saved: {filename}")
-
-network_specs = [
-    ("treatment", 2017, "network_treatment_pre_datathon.jpg"),
-    ("control",    2017, "network_control_pre_datathon.jpg"),
-    ("treatment", 2023, "network_treatment_post_datathon.jpg"),
-    ("control",    2023, "network_control_post_datathon.jpg"),
-]
-
-for cohort, year, file in network_specs:
-    G, participants, all_nodes = build_one_year_network(df, cohort, year)
-    title = ""
-    if year == 2017:
-        title = f"{cohort.capitalize()} Cohort Coauthor Network (Pre Datathon)"
-    else:
-        title = f"{cohort.capitalize()} Cohort Coauthor Network (Post Datathon)"
-    plot_network(G, participants, title, file)
+from dataset import load_combined
+from graph_index import GraphIndex
+from network_metrics import average_clustering
+from render_networks import render_specs
+
+# "draft" renders at 72 dpi for quick checks, "publication" at 300 dpi
+RENDER_MODE = "publication"
+
+
+# graphs come from the GraphIndex built once over the whole dataset
+def build_one_year_network(index, group, paper_year):
+    G = index.networkx(group, paper_year)
+    return G, index.participants(group, paper_year), set(G.nodes())
+
 
 def network_summary(G, participants):
     num_nodes = G.number_of_nodes()
     num_edges = G.number_of_edges()
-    
+
     # Average degree
     if num_nodes > 0:
         avg_degree = sum(dict(G.degree()).values()) / num_nodes
     else:
         avg_degree = 0
-    
+
     # Network density
     density = nx.density(G)
-    
+
     # Average Clustering Coefficient
-    avg_clustering = nx.average_clustering(G)
-    
+    avg_clustering = average_clustering(G)
+
     # Number of unique coauthors excluding participants
     unique_coauthors = len(set(G.nodes()) - set(participants))
-    
+
     summary = {
         "num_nodes": num_nodes,
         "num_edges": num_edges,
@@ -127,25 +46,54 @@ def network_summary(G, participants):
     return summary
 
 
-network_specs = [
-    ("treatment", 2017, "network_treatment_2017.jpg"),
-    ("control",    2017, "network_control_2017.jpg"),
-    ("treatment", 2023, "network_treatment_2023.jpg"),
-    ("control",    2023, "network_control_2023.jpg"),
-]
-
-for cohort, year, file in network_specs:
-    G, participants, all_nodes = build_one_year_network(df, cohort, year)
-    
-    # Plot network
-    title = f"{cohort.capitalize()} Cohort Coauthor Network ({year})"
-    plot_network(G, participants, title, file)
-    
-    # Compute & print network summary
-    summary = network_summary(G, participants)
-    print(f"{cohort.capitalize()} {year} Network")
-    for k, v in summary.items():
-        if isinstance(v, float):
-            print(f"{k}: {v:.4f}")
+# the figures are rendered in a process pool, so the script only runs when started
+# directly and not when a worker imports it
+if __name__ == "__main__":
+    # coauthors come back as lists, country / gender counts as dicts
+    df = load_combined("Final_Combined.csv")
+
+    # every (group, year) graph is built once on first use and shared by both passes below
+    index = GraphIndex(df)
+
+    network_specs = [
+        ("treatment", 2017, "network_treatment_pre_datathon.jpg"),
+        ("control",    2017, "network_control_pre_datathon.jpg"),
+        ("treatment", 2023, "network_treatment_post_datathon.jpg"),
+        ("control",    2023, "network_control_post_datathon.jpg"),
+    ]
+
+    # figures are rendered in parallel, post-datathon layouts start from the pre-datathon ones
+    specs = []
+    for cohort, year, file in network_specs:
+        if year == 2017:
+            title = f"{cohort.capitalize()} Cohort Coauthor Network (Pre Datathon)"
         else:
-            print(f"{k}: {v}")
\ No newline at end of file
+            title = f"{cohort.capitalize()} Cohort Coauthor Network (Post Datathon)"
+        specs.append((cohort, year, file, title))
+    render_specs(index, specs, mode=RENDER_MODE)
+
+    network_specs = [
+        ("treatment", 2017, "network_treatment_2017.jpg"),
+        ("control",    2017, "network_control_2017.jpg"),
+        ("treatment", 2023, "network_treatment_2023.jpg"),
+        ("control",    2023, "network_control_2023.jpg"),
+    ]
+
+    # same graphs and layout options as above so the layouts come from the cache
+    render_specs(index, [(cohort, year, file, f"{cohort.capitalize()} Cohort Coauthor Network ({year})")
+                         for cohort, year, file in network_specs], mode=RENDER_MODE)
+
+    for cohort, year, file in network_specs:
+        G, participants, all_nodes = build_one_year_network(index, cohort, year)
+
+        # Compute & print network summary
+        summary = network_summary(G, participants)
+        print(f"{cohort.capitalize()} {year} Network")
+        for k, v in summary.items():
+            if isinstance(v, float):
+                print(f"{k}: {v:.4f}")
+            else:
+                print(f"{k}: {v}")
+
+    # metrics for every cohort and year in YEARS_OF_INTEREST
+    print(index.metrics_table().to_string(index=False))
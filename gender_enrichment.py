@@ -0,0 +1,106 @@
+from typing import Dict, Iterable, Optional
+import sqlite3
+
+import numpy as np
+import pandas as pd
+from gender_guesser.detector import Detector
+
+from columnar_io import GENDER_COUNT_COLUMNS, parse_name_list
+
+
+# Gender enrichment for participants and coauthors. Every first name in the dataset is
+# looked up once: unique (lower-cased) first names are collected, the ones missing from
+# a persistent SQLite cache are resolved through gender_guesser and stored, and the
+# results are mapped back onto all coauthor occurrences with numpy to give integer
+# male / female / unknown counts per row. mostly_male and mostly_female count as male
+# and female, everything else (andy, unknown) as unknown.
+#
+#   cache = GenderCache()
+#   df = enrich_genders(df, cache)
+
+DEFAULT_CACHE_PATH = "gender_cache.sqlite"
+
+# detector answer -> 0 male, 1 female, 2 unknown, same order as GENDER_COUNT_COLUMNS
+GENDER_CODES = {"male": 0, "mostly_male": 0, "female": 1, "mostly_female": 1}
+UNKNOWN = 2
+PARTICIPANT_LABELS = np.array(["male", "female", "unknown"], dtype=object)
+
+
+class GenderCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._detector: Optional[Detector] = None
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS genders (first_name TEXT PRIMARY KEY, gender TEXT NOT NULL)")
+        self._conn.commit()
+
+    # the detector loads its name list on construction, so only build it on a cache miss
+    @property
+    def detector(self) -> Detector:
+        if self._detector is None:
+            self._detector = Detector(case_sensitive=False)
+        return self._detector
+
+    # raw detector answers for the given lower-cased first names
+    def lookup(self, first_names: Iterable[str]) -> Dict[str, str]:
+        wanted = list(dict.fromkeys(first_names))
+        found: Dict[str, str] = {}
+        for start in range(0, len(wanted), 500):
+            chunk = wanted[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT first_name, gender FROM genders WHERE first_name IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update(rows)
+
+        missing = [name for name in wanted if name not in found]
+        if missing:
+            resolved = {name: self.detector.get_gender(name) for name in missing}
+            self._conn.executemany("INSERT OR REPLACE INTO genders VALUES (?, ?)", resolved.items())
+            self._conn.commit()
+            found.update(resolved)
+        return found
+
+    def close(self):
+        self._conn.close()
+
+
+# "Jane Q. Doe" -> "jane"; empty names give ""
+def first_names(names: pd.Series) -> pd.Series:
+    return names.astype(str).str.strip().str.split(n=1).str[0].fillna("").str.lower()
+
+
+# gender code per name, each distinct first name resolved once
+def gender_codes(names: pd.Series, cache: GenderCache) -> np.ndarray:
+    codes, uniques = pd.factorize(first_names(names))
+    answers = cache.lookup(name for name in uniques if name)
+    unique_codes = np.array([GENDER_CODES.get(answers.get(name), UNKNOWN) for name in uniques], dtype=np.int64)
+    return unique_codes[codes] if len(codes) else np.zeros(0, dtype=np.int64)
+
+
+# male / female / unknown coauthor counts per row of a coauthors column
+def coauthor_gender_counts(coauthors: pd.Series, cache: GenderCache) -> pd.DataFrame:
+    lists = [[name for name in (n.strip() for n in parse_name_list(v)) if name] for v in coauthors]
+    lengths = np.fromiter((len(names) for names in lists), dtype=np.int64, count=len(lists))
+    flat = pd.Series([name for names in lists for name in names], dtype=object)
+    row = np.repeat(np.arange(len(lists)), lengths)
+    # one bincount over (row, code) pairs gives the whole count table
+    table = np.bincount(row * 3 + gender_codes(flat, cache), minlength=len(lists) * 3).reshape(len(lists), 3)
+    return pd.DataFrame(table.astype(np.int32), columns=GENDER_COUNT_COLUMNS, index=coauthors.index)
+
+
+# adds the count columns, the {'M': .., 'F': ..} coauthor_genders map the other scripts
+# read, and fills missing participant genders from author_name
+def enrich_genders(df: pd.DataFrame, cache: GenderCache) -> pd.DataFrame:
+    df = df.copy()
+    counts = coauthor_gender_counts(df["coauthors"], cache)
+    for col in GENDER_COUNT_COLUMNS:
+        df[col] = counts[col]
+    df["coauthor_genders"] = [{"M": int(m), "F": int(f)} for m, f in
+                              zip(counts[GENDER_COUNT_COLUMNS[0]], counts[GENDER_COUNT_COLUMNS[1]])]
+
+    guessed = PARTICIPANT_LABELS[gender_codes(df["author_name"], cache)]
+    if "gender" in df.columns:
+        df["gender"] = df["gender"].where(df["gender"].notna(), pd.Series(guessed, index=df.index))
+    else:
+        df["gender"] = guessed
+    return df
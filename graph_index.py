@@ -0,0 +1,78 @@
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+from constants import YEARS_OF_INTEREST
+from network_metrics import network_summary
+from sparse_graph import InternedRows, SparseGraph, intern_dataset, sparse_from_pairs
+
+
+# All (group, year) coauthor networks of the dataset behind one index. The rows are
+# partitioned by (group, paper_year) in a single groupby and the names interned once;
+# each graph is built on first access and cached, so the full year-by-cohort metrics
+# table costs one partition plus one sparse build per cell.
+#
+#   index = GraphIndex(load_combined())
+#   index.graph("treatment", 2023)
+#   index.metrics_table()
+
+COHORTS = ["treatment", "control"]
+
+
+class GraphIndex:
+    def __init__(self, df: pd.DataFrame, years: Optional[List[int]] = None, rows: Optional[InternedRows] = None):
+        self.df = df
+        self.years = sorted(years or YEARS_OF_INTEREST)
+        self.rows = rows or intern_dataset(df)
+        found = [g for g in df["group"].dropna().unique() if g not in COHORTS]
+        self.groups = [g for g in COHORTS if g in set(df["group"])] + sorted(found)
+
+        # (group, year) -> row positions, one pass over the dataset
+        self._positions: Dict[Tuple[str, int], np.ndarray] = {
+            (group, int(year)): positions
+            for (group, year), positions in df.groupby(["group", "paper_year"], sort=False).indices.items()
+        }
+        self._graphs: Dict[Tuple[str, int, bool], SparseGraph] = {}
+        self._nx_graphs: Dict[Tuple[str, int, bool], nx.Graph] = {}
+
+    def keys(self) -> Iterator[Tuple[str, int]]:
+        for group in self.groups:
+            for year in self.years:
+                yield group, year
+
+    def positions(self, group: str, year: int) -> np.ndarray:
+        return self._positions.get((group, int(year)), np.empty(0, dtype=np.int64))
+
+    def rows_for(self, group: str, year: int) -> pd.DataFrame:
+        return self.df.iloc[self.positions(group, year)]
+
+    def graph(self, group: str, year: int, weighted: bool = False) -> SparseGraph:
+        key = (group, int(year), weighted)
+        if key not in self._graphs:
+            positions = self.positions(group, year)
+            authors, coauthors = self.rows.pairs(positions)
+            self._graphs[key] = sparse_from_pairs(self.rows.index, self.rows.authors[positions],
+                                                  authors, coauthors, weighted)
+        return self._graphs[key]
+
+    # networkx copy for plotting / algorithms not on the sparse path, also cached
+    def networkx(self, group: str, year: int, weighted: bool = False) -> nx.Graph:
+        key = (group, int(year), weighted)
+        if key not in self._nx_graphs:
+            self._nx_graphs[key] = self.graph(group, year, weighted).to_networkx()
+        return self._nx_graphs[key]
+
+    def participants(self, group: str, year: int) -> set:
+        return self.graph(group, year).participants()
+
+    # one row per (group, year) with the network_summary metrics; clustering is
+    # "exact", "approx" (sampled, within epsilon at the given confidence) or None
+    def metrics_table(self, clustering: Optional[str] = "exact", epsilon: float = 0.01,
+                      confidence: float = 0.95, seed: Optional[int] = None) -> pd.DataFrame:
+        records = []
+        for group, year in self.keys():
+            summary: Dict[str, Any] = {"group": group, "year": year, "num_papers": len(self.positions(group, year))}
+            summary.update(network_summary(self.graph(group, year), clustering, epsilon, confidence, seed))
+            records.append(summary)
+        return pd.DataFrame(records)
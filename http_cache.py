@@ -0,0 +1,117 @@
+from typing import Dict, Optional, Any
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+
+# Persistent URL -> response cache for OpenAlex calls, stored in one SQLite file.
+# Only successful (200) responses are stored. Bodies are zlib-compressed and the
+# least recently used entries are evicted once the file grows past max_bytes.
+
+DEFAULT_CACHE_PATH = "openalex_cache.sqlite"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+
+# minimal stand-in for requests.Response so callers of safe_request don't change
+class CachedResponse:
+    def __init__(self, status_code: int, content: bytes, headers: Optional[Dict[str, str]] = None,
+                 from_cache: bool = True):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        # cache-only mode: never touch the network, stale entries are still served
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " status INTEGER NOT NULL,"
+            " body BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, body, stored_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            status, body, stored_at = row
+            expired = self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+            if expired and not self.offline:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+        return CachedResponse(status, zlib.decompress(body))
+
+    def put(self, url: str, status: int, content: bytes):
+        if status != 200:
+            return
+        body = zlib.compress(content)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, status, body, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (url, status, body, len(body), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    # drop least recently used entries until we are back under 90% of max_bytes
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for url, size in self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            doomed.append((url,))
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", doomed)
+
+    def clear_expired(self):
+        if self.ttl_seconds is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# returned on a cache miss in offline mode, like an HTTP only-if-cached miss
+def offline_miss() -> CachedResponse:
+    return CachedResponse(504, b"{}", from_cache=False)
@@ -0,0 +1,83 @@
+from typing import List, Dict, Optional, Any, Tuple
+import heapq
+import numpy as np
+import pandas as pd
+
+from graph_index import GraphIndex
+from network_metrics import average_clustering
+from window_networks import WindowNetwork, block_edges
+
+
+# Robustness of a cohort-year network to losing its best-connected participants. A
+# participant's degree is the number of unique coauthors over their own papers, which
+# removing other participants never changes, so hubs come off a heap keyed by
+# (-degree, first appearance) - the same order the original re-scan picked them in.
+# Each removal subtracts that author's edge counts from a WindowNetwork, giving the
+# network summary for every k = 0..K in one pass.
+#
+#   hub_removal_sweep(index, "treatment", 2023, max_k=20)
+
+
+# code -> unique coauthor count for the participants of the given rows; a paper with no
+# coauthors counts once, as the NaN from explode().unique() did in the original scan
+def participant_degrees(index: GraphIndex, positions: np.ndarray) -> Dict[int, int]:
+    rows = index.rows
+    authors, coauthors = rows.pairs(positions)
+    pair_keys = np.unique(authors.astype(np.int64) * len(rows.index) + coauthors)
+    codes, degrees = np.unique(pair_keys // len(rows.index), return_counts=True)
+    result = dict.fromkeys(rows.authors[positions].tolist(), 0)
+    result.update(zip(codes.tolist(), degrees.tolist()))
+    empty = rows.offsets[positions + 1] == rows.offsets[positions]
+    for code in np.unique(rows.authors[positions][empty]).tolist():
+        result[code] += 1
+    return result
+
+
+# participants in removal order: highest degree first, ties by first appearance
+def hub_order(index: GraphIndex, positions: np.ndarray) -> List[Tuple[int, int]]:
+    degrees = participant_degrees(index, positions)
+    heap = [(-degree, rank, code) for rank, (code, degree) in enumerate(degrees.items())]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        degree, _, code = heapq.heappop(heap)
+        order.append((code, -degree))
+    return order
+
+
+def top_k_hubs(index: GraphIndex, group: str, year: int, k: int) -> List[str]:
+    order = hub_order(index, index.positions(group, year))
+    return index.rows.index.decode([code for code, _ in order[:k]]).tolist()
+
+
+# one row per k with the network summary after removing the k highest-degree participants;
+# clustering=True adds the exact clustering coefficient from a snapshot per k
+def hub_removal_sweep(index: GraphIndex, group: str, year: int, max_k: int = 10,
+                      clustering: bool = False) -> pd.DataFrame:
+    positions = index.positions(group, year)
+    author_codes = index.rows.authors[positions]
+    by_author: Dict[int, np.ndarray] = pd.Series(positions).groupby(author_codes).apply(np.asarray).to_dict()
+
+    net = WindowNetwork(index.rows.index)
+    net.add_year(block_edges(index.rows, positions))
+    removals = [(None, None)] + hub_order(index, positions)[:max_k]
+    records: List[Dict[str, Any]] = []
+    for k, (code, degree) in enumerate(removals):
+        if code is not None:
+            net.remove_year(block_edges(index.rows, by_author[code]))
+        record = {"k": k, "removed": index.rows.index.names[code] if code is not None else None,
+                  "removed_degree": degree, **net.summary()}
+        if clustering:
+            record["cluster_coefficient"] = average_clustering(net.snapshot(weighted=False))
+        records.append(record)
+    table = pd.DataFrame(records)
+    table.insert(0, "year", year)
+    table.insert(0, "group", group)
+    return table
+
+
+def robustness_curves(index: GraphIndex, max_k: int = 10, years: Optional[List[int]] = None,
+                      clustering: bool = False) -> pd.DataFrame:
+    tables = [hub_removal_sweep(index, group, year, max_k, clustering)
+              for group in index.groups for year in (years or index.years)]
+    return pd.concat(tables, ignore_index=True)
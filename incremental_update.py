@@ -0,0 +1,226 @@
+from typing import List, Dict, Optional, Any, Tuple
+import argparse
+import datetime
+import json
+import os
+
+import pandas as pd
+
+import dataCollect
+from batch_collect import DEFAULT_BATCH_SIZE, fetch_works_for_author_batch, short_id
+from checkpoint import COMPLETED
+from columnar_io import GENDER_COUNT_COLUMNS, read_dataset, save_results
+from dataCollect import (
+    OUTPUT_COLUMNS,
+    WORK_FIELDS,
+    build_paper_row,
+    estimate_career_stage,
+    fetch_career_years,
+    resolve_authors_batch,
+)
+
+
+# Incremental refresh of a collected dataset (e.g. Final_Combined.csv). With an
+# OpenAlex premium key (OPENALEX_API_KEY or --api-key; from_updated_date is a
+# premium-only filter) each batch of authors fetches only the works created or updated
+# since the last recorded run. Without a key a batch instead re-fetches its works in
+# YEARS_OF_INTEREST, picking up citation and author changes, plus every work created
+# since the last run (from_created_date), which catches new papers outside the window
+# that move the year bounds. Works are merged by work id / DOI (or author + title +
+# year for rows collected before ids were stored): changed rows are updated in place
+# and new ones appended. career_stage is recomputed only for authors whose first /
+# last publication year moved. Refresh queries skip the response cache, a rerun for
+# the same window must see the current data.
+#
+#   python incremental_update.py Final_Combined.csv --since 2025-01-01
+
+DEFAULT_STATE_PATH = "refresh_state.json"
+
+def load_state(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"last_run": None, "year_bounds": {}}
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    state.setdefault("year_bounds", {})
+    return state
+
+
+def save_state(state: Dict[str, Any], path: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_existing(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return read_dataset(path)
+    return pd.read_csv(path)
+
+
+# author_id for rows collected before the column existed, resolved by name
+def fill_author_ids(df: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    missing = df.loc[df["author_id"].isna(), "author_name"].dropna().unique().tolist()
+    if not missing:
+        return df
+    resolved = resolve_authors_batch(missing, batch_size=batch_size)
+    ids = {name: r["author"]["id"] for name, r in resolved.items() if r["author"] is not None}
+    fill = df["author_name"].map(ids)
+    df["author_id"] = df["author_id"].where(df["author_id"].notna(), fill)
+    unresolved = len(missing) - len(ids)
+    if unresolved:
+        print(f"{unresolved} authors could not be matched to an OpenAlex id and are not refreshed")
+    return df
+
+
+# works of a batch that may have changed since `since`, as (status, works, routes) like
+# fetch_works_for_author_batch; always fresh from the API, never from the response cache
+def fetch_refresh_batch(batch: List[str], since: str) -> Tuple[str, Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+    if dataCollect.API_KEY:
+        return fetch_works_for_author_batch(batch, extra_filter=f"from_updated_date:{since}", select=WORK_FIELDS,
+                                            use_cache=False)
+
+    status, works, routes = fetch_works_for_author_batch(batch, projected=True, use_cache=False)
+    if status != COMPLETED:
+        return status, works, routes
+    status, created, created_routes = fetch_works_for_author_batch(
+        batch, extra_filter=f"from_created_date:{since}", select=WORK_FIELDS, use_cache=False)
+    for key, work in created.items():
+        works.setdefault(key, work)
+    for author_id, keys in created_routes.items():
+        seen = set(routes[author_id])
+        routes[author_id].extend(k for k in keys if k not in seen)
+    return status, works, routes
+
+
+# (author, work_id), (author, doi) and (author, title, year) -> row index
+def build_row_index(df: pd.DataFrame) -> Tuple[Dict, Dict, Dict]:
+    by_work, by_doi, by_legacy = {}, {}, {}
+    for idx, author, work_id, doi, title, year in zip(df.index, df["author_name"], df["work_id"], df["doi"],
+                                                      df["paper_title"], df["paper_year"]):
+        if isinstance(work_id, str):
+            by_work[(author, work_id)] = idx
+        if isinstance(doi, str):
+            by_doi[(author, doi)] = idx
+        by_legacy[(author, title, int(year))] = idx
+    return by_work, by_doi, by_legacy
+
+
+def refresh_dataset(dataset_path: str, output_path: Optional[str] = None, state_path: str = DEFAULT_STATE_PATH,
+                    since: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    run_date = datetime.date.today().isoformat()
+    state = load_state(state_path)
+    since = since or state.get("last_run")
+    if not since:
+        raise ValueError("No previous run recorded in the state file, pass since=YYYY-MM-DD")
+
+    df = load_existing(dataset_path)
+    for col in ("work_id", "doi", "author_id"):
+        if col not in df.columns:
+            df[col] = None
+    df = fill_author_ids(df, batch_size)
+
+    # author_id -> the display name used in author_name / for coauthor exclusion
+    authors = df.dropna(subset=["author_id"]).groupby("author_id", sort=False)["author_name"].first().to_dict()
+
+    # year bounds are seeded once per author with the cheap group_by aggregate; a seeded
+    # stage that disagrees with the dataset counts as a change too
+    bounds: Dict[str, List[int]] = state["year_bounds"]
+    current_stage = df.dropna(subset=["author_id"]).groupby("author_id", sort=False)["career_stage"].first()
+    changed_stage = {}
+    for author_id in authors:
+        if author_id not in bounds:
+            status, year_bounds = fetch_career_years(author_id, use_cache=False)
+            if status == COMPLETED and year_bounds is not None:
+                bounds[author_id] = list(year_bounds)
+                stage = estimate_career_stage(*year_bounds)
+                if stage != current_stage.get(author_id):
+                    changed_stage[author_id] = stage
+
+    updated_works: Dict[str, List[Dict[str, Any]]] = {}
+    complete = True
+    author_ids = list(authors)
+    for i in range(0, len(author_ids), batch_size):
+        batch = author_ids[i:i + batch_size]
+        status, works, routes = fetch_refresh_batch(batch, since)
+        if status != COMPLETED:
+            # keep last_run where it is so the next refresh covers this window again
+            complete = False
+            continue
+        for author_id in batch:
+            updated_works[author_id] = [works[k] for k in routes[short_id(author_id)]]
+
+    for author_id, works in updated_works.items():
+        years = [w["publication_year"] for w in works if w.get("publication_year")]
+        if not years:
+            continue
+        old = bounds.get(author_id)
+        new = [min(years + old[:1]), max(years + old[1:])] if old else [min(years), max(years)]
+        if new != old:
+            bounds[author_id] = new
+            changed_stage[author_id] = estimate_career_stage(*new)
+
+    # collector columns may hold dicts / lists after the merge
+    for col in OUTPUT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(object)
+
+    for author_id, stage in changed_stage.items():
+        df.loc[df["author_id"] == author_id, "career_stage"] = stage
+    if changed_stage:
+        print(f"Recomputed career stage for {len(changed_stage)} authors")
+
+    by_work, by_doi, by_legacy = build_row_index(df)
+    author_extras = df.groupby("author_id", sort=False).first()
+    gender_cols = [c for c in ["coauthor_genders"] + GENDER_COUNT_COLUMNS if c in df.columns]
+    extra_cols = [c for c in df.columns if c not in OUTPUT_COLUMNS and c not in gender_cols]
+    new_rows = []
+    updated = 0
+    for author_id, works in updated_works.items():
+        display_name = authors[author_id]
+        stage = changed_stage.get(author_id) or df.loc[df["author_id"] == author_id, "career_stage"].iloc[0]
+        for w in works:
+            row = build_paper_row(w, display_name, stage, author_id)
+            if row is None:
+                continue
+            idx = by_work.get((display_name, row["work_id"]))
+            if idx is None and row["doi"]:
+                idx = by_doi.get((display_name, row["doi"]))
+            if idx is None:
+                idx = by_legacy.get((display_name, row["paper_title"], int(row["paper_year"])))
+
+            if idx is not None:
+                for col, value in row.items():
+                    df.at[idx, col] = value
+                # coauthors may have changed, the enrichment step recomputes genders
+                for col in gender_cols:
+                    df.at[idx, col] = None
+                updated += 1
+            else:
+                for col in extra_cols:
+                    row.setdefault(col, author_extras.at[author_id, col])
+                new_rows.append(row)
+
+    if new_rows:
+        df = pd.concat([df, pd.DataFrame(new_rows)], ignore_index=True)
+    print(f"Refresh since {since}: {updated} rows updated, {len(new_rows)} rows added")
+
+    save_results(df, output_path or dataset_path)
+    if complete:
+        state["last_run"] = run_date
+    state["year_bounds"] = bounds
+    save_state(state, state_path)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh a collected dataset with recently updated works")
+    parser.add_argument("dataset", help="CSV or Parquet dataset, e.g. Final_Combined.csv")
+    parser.add_argument("--output", help="write here instead of updating the dataset in place")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH)
+    parser.add_argument("--since", help="YYYY-MM-DD, defaults to the last recorded run")
+    parser.add_argument("--api-key", help="OpenAlex premium key, enables the from_updated_date query")
+    args = parser.parse_args()
+    if args.api_key:
+        dataCollect.set_api_key(args.api_key)
+    refresh_dataset(args.dataset, args.output, args.state, args.since)
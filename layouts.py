@@ -0,0 +1,176 @@
+from typing import Dict, Optional, Any
+import hashlib
+import json
+import os
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+from scipy.spatial import cKDTree
+
+
+# Layout cache for the network plots. A layout is stored under a hash of the graph's
+# nodes and edges, the layout parameters and any initial positions, so an unchanged
+# graph is laid out once across reruns and across the pre / post passes of a script.
+# seed_positions() starts a later year's layout from the earlier year's positions of
+# shared nodes, keeping plots comparable and converging faster. method="fast" is a
+# vectorized Fruchterman-Reingold with repulsion limited to neighbours found through a
+# KD-tree (O(n log n) per iteration) for graphs too large for nx.spring_layout.
+#
+#   pos_2017 = cached_layout(G_2017, seed=42, k=0.6, iterations=200)
+#   pos_2023 = cached_layout(G_2023, seed=42, k=0.6, iterations=200, init_pos=pos_2017)
+
+DEFAULT_CACHE_DIR = "layout_cache"
+
+# method="auto" switches to the fast engine above this many nodes
+FAST_LAYOUT_NODES = 5000
+
+
+def graph_hash(G: nx.Graph, extra: Optional[Dict[str, Any]] = None) -> str:
+    h = hashlib.sha256()
+    for node in sorted(map(str, G.nodes())):
+        h.update(node.encode("utf-8") + b"\0")
+    h.update(b"\1")
+    for u, v in sorted(tuple(sorted((str(u), str(v)))) for u, v in G.edges()):
+        h.update(u.encode("utf-8") + b"\0" + v.encode("utf-8") + b"\0")
+    if extra:
+        h.update(json.dumps(extra, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def positions_hash(pos: Optional[Dict[Any, np.ndarray]]) -> Optional[str]:
+    if not pos:
+        return None
+    h = hashlib.sha256()
+    for node in sorted(pos, key=str):
+        h.update(str(node).encode("utf-8") + b"\0" + np.asarray(pos[node], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+# previous positions for shared nodes, new nodes at the mean of their placed neighbours
+# (plus a little jitter) or at random when none of their neighbours is placed
+def seed_positions(G: nx.Graph, previous: Dict[Any, np.ndarray], seed: int = 42) -> Dict[Any, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    pos = {n: np.asarray(previous[n], dtype=np.float64) for n in G.nodes() if n in previous}
+    if pos:
+        coords = np.array(list(pos.values()))
+        low, high = coords.min(axis=0), coords.max(axis=0)
+    else:
+        low, high = np.array([-1.0, -1.0]), np.array([1.0, 1.0])
+    spread = 0.02 * max(float(np.max(high - low)), 1e-3)
+    for n in G.nodes():
+        if n in pos:
+            continue
+        placed = [pos[m] for m in G[n] if m in pos and m != n]
+        if placed:
+            pos[n] = np.mean(placed, axis=0) + rng.normal(0, spread, 2)
+        else:
+            pos[n] = rng.uniform(low, high)
+    return pos
+
+
+# center on the origin and scale so the largest coordinate is 1, like nx.rescale_layout
+def rescale(coords: np.ndarray) -> np.ndarray:
+    coords = coords - coords.mean(axis=0)
+    lim = np.abs(coords).max()
+    return coords / lim if lim > 0 else coords
+
+
+def force_layout(A: sp.csr_matrix, init: Optional[np.ndarray] = None, k: Optional[float] = None,
+                 iterations: int = 50, seed: int = 42, cutoff: float = 3.0) -> np.ndarray:
+    n = A.shape[0]
+    if n <= 1:
+        return np.zeros((n, 2))
+    k = k or np.sqrt(1.0 / n)
+    # start on a square of side k * sqrt(n), about one node per k^2, so the cutoff
+    # neighbourhood holds a few dozen nodes whatever k is
+    side = k * np.sqrt(n)
+    rng = np.random.default_rng(seed)
+    if init is None:
+        pos = rng.random((n, 2)) * side
+    else:
+        pos = (rescale(np.array(init, dtype=np.float64)) + 1) * (side / 2)
+    upper = sp.triu(A, k=1).tocoo()
+    src, dst = upper.row, upper.col
+
+    # same cooling schedule as nx's Fruchterman-Reingold
+    t = max(float(np.ptp(pos[:, 0])), float(np.ptp(pos[:, 1]))) * 0.1
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        disp = np.zeros((n, 2))
+
+        # repulsion k^2 / d only between nodes closer than cutoff * k
+        pairs = cKDTree(pos).query_pairs(cutoff * k, output_type="ndarray")
+        if len(pairs):
+            i, j = pairs[:, 0], pairs[:, 1]
+            delta = pos[i] - pos[j]
+            dist2 = np.maximum((delta ** 2).sum(axis=1), 1e-4)
+            force = delta * (k * k / dist2)[:, None]
+            for axis in (0, 1):
+                disp[:, axis] += np.bincount(i, force[:, axis], n) - np.bincount(j, force[:, axis], n)
+
+        # attraction d^2 / k along edges
+        if len(src):
+            delta = pos[src] - pos[dst]
+            dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-2)
+            force = delta * (dist / k)[:, None]
+            for axis in (0, 1):
+                disp[:, axis] -= np.bincount(src, force[:, axis], n) - np.bincount(dst, force[:, axis], n)
+
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-2)
+        pos += disp * (np.minimum(length, t) / length)[:, None]
+        t -= dt
+    return rescale(pos)
+
+
+def compute_layout(G: nx.Graph, method: str = "spring", seed: int = 42, k: Optional[float] = None,
+                   iterations: int = 50, init_pos: Optional[Dict[Any, np.ndarray]] = None) -> Dict[Any, np.ndarray]:
+    if method == "auto":
+        method = "fast" if G.number_of_nodes() > FAST_LAYOUT_NODES else "spring"
+    if method == "spring":
+        return nx.spring_layout(G, pos=init_pos, seed=seed, k=k, iterations=iterations)
+    if method != "fast":
+        raise ValueError(f"layout method must be 'spring', 'fast' or 'auto', got {method!r}")
+    nodes = list(G.nodes())
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=None, format="csr") if nodes else sp.csr_matrix((0, 0))
+    init = np.array([init_pos[n] for n in nodes]) if init_pos else None
+    coords = force_layout(sp.csr_matrix(A), init, k, iterations, seed)
+    return dict(zip(nodes, coords))
+
+
+def load_layout(path: str) -> Optional[Dict[str, np.ndarray]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return dict(zip(data["nodes"].tolist(), data["positions"]))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_layout(pos: Dict[Any, np.ndarray], path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    nodes = list(pos)
+    tmp = f"{path}.tmp.npz"
+    np.savez(tmp, nodes=np.array([str(n) for n in nodes]), positions=np.array([pos[n] for n in nodes]))
+    os.replace(tmp, path)
+
+
+# init_pos is usually the layout of the same cohort in an earlier year; shared nodes
+# start where they were and new ones next to their neighbours
+def cached_layout(G: nx.Graph, method: str = "spring", seed: int = 42, k: Optional[float] = None,
+                  iterations: int = 50, init_pos: Optional[Dict[Any, np.ndarray]] = None,
+                  cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Dict[Any, np.ndarray]:
+    start = seed_positions(G, init_pos, seed) if init_pos else None
+    params = {"method": method, "seed": seed, "k": k, "iterations": iterations, "init": positions_hash(start)}
+    path = os.path.join(cache_dir, f"{graph_hash(G, params)}.npz") if cache_dir else None
+
+    cached = load_layout(path) if path else None
+    if cached is not None and len(cached) == G.number_of_nodes():
+        by_name = {str(n): n for n in G.nodes()}
+        # fresh arrays, callers are free to modify positions in place
+        return {by_name[name]: np.array(xy) for name, xy in cached.items() if name in by_name}
+
+    pos = compute_layout(G, method, seed, k, iterations, start)
+    if path:
+        save_layout(pos, path)
+    return {n: np.array(xy) for n, xy in pos.items()}
@@ -1,4 +1,3 @@
-import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
 import random
@@ -6,56 +5,28 @@ from collections import Counter, defaultdict
 import numpy as np
 import math
 
-df = pd.read_csv("Final_Combined.csv")
+from coauthor_network import network_from_rows, select_rows
+from dataset import load_combined
+from network_metrics import average_clustering
 
-def fix_coauthors(x):
-    if pd.isna(x):
-        return []
-    x = x.strip("[]")
-    if x == "":
-        return []
-    return [name.strip().strip("'").strip('"') for name in x.split(",")]
-
-df["coauthors"] = df["coauthors"].apply(fix_coauthors)
+# coauthors come back as lists, country / gender counts as dicts
+df = load_combined("Final_Combined.csv")
 
 def sample_authors_by_seed(participants_set, fraction=0.75, seed=42):
     participants_list = list(participants_set)
-    random.seed(seed)
+    rng = random.Random(seed)
     num_to_select = int(len(participants_list) * fraction)
-    return set(random.sample(participants_list, num_to_select))
+    return set(rng.sample(participants_list, num_to_select))
 
 def build_one_year_network(df, group, paper_year, sampled_participants=None):
 
-    subset = df[(df["group"] == group) & (df["paper_year"] == paper_year)]
-
-    if sampled_participants is not None:
-        subset = subset[subset["author_name"].isin(sampled_participants)]
-
-    participants = set(subset["author_name"].unique())
+    subset = select_rows(df, group, paper_year, sampled_participants)
 
     # Count number of papers per participant
     paper_counts = Counter(subset["author_name"])
 
-    # Count coauthor ties edge weights
-    edge_counter = Counter()
-    all_authors = set()
-
-    for _, row in subset.iterrows():
-        author = row["author_name"]
-        coauthors = row["coauthors"]
-
-        all_authors.add(author)
-        all_authors.update(coauthors)
-
-        for co in coauthors:
-            edge = tuple(sorted([author, co]))
-            edge_counter[edge] += 1
-
-    G = nx.Graph()
-    G.add_nodes_from(all_authors)
-
-    for (a, b), w in edge_counter.items():
-        G.add_edge(a, b, weight=w)
+    # Coauthor ties with weight = number of shared papers, counted in one groupby
+    G, participants, _ = network_from_rows(subset, weighted=True)
 
     return G, participants, paper_counts
 
@@ -138,7 +109,7 @@ def network_summary(G, participants):
         "avg_degree": sum(dict(G.degree()).values()) / G.number_of_nodes() if G.number_of_nodes() > 0 else 0,
         "density": nx.density(G),
         "unique_coauthors": len(set(G.nodes()) - set(participants)),
-        "cluster_coefficient": nx.average_clustering(G)
+        "cluster_coefficient": average_clustering(G)
     }
 
 treatment_authors = set(df[df["group"] == "treatment"]["author_name"].unique())
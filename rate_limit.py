@@ -0,0 +1,76 @@
+from typing import Optional, Tuple
+import asyncio
+import threading
+import time
+
+from telemetry import get_telemetry
+
+
+# Process-wide request pacing for OpenAlex. Every collector, sequential, batched or
+# concurrent, takes a slot from the same limiter before each request, so together
+# they stay within one API budget, and a 429's Retry-After holds all of them back.
+
+DEFAULT_REQUESTS_PER_SECOND = 8
+
+
+class RateLimiter:
+    # hands out evenly spaced request slots; a 429 pushes every future slot back
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND):
+        self.interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+
+    # returns (seconds to wait, why): retry_after when a 429 set the slot, else rate_limit
+    def _reserve(self) -> Tuple[float, str]:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._blocked_until)
+            reason = "retry_after" if self._blocked_until > max(now, self._next_slot) else "rate_limit"
+            self._next_slot = slot + self.interval
+            return slot - now, reason
+
+    def _still_blocked(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._blocked_until
+
+    async def acquire(self):
+        while True:
+            delay, reason = self._reserve()
+            if delay > 0:
+                get_telemetry().record_sleep(reason, delay)
+                await asyncio.sleep(delay)
+            # a Retry-After may have arrived while we were waiting for our slot
+            if not self._still_blocked():
+                return
+
+    def acquire_sync(self):
+        while True:
+            delay, reason = self._reserve()
+            if delay > 0:
+                get_telemetry().record_sleep(reason, delay)
+                time.sleep(delay)
+            if not self._still_blocked():
+                return
+
+    def set_rate(self, requests_per_second: float):
+        with self._lock:
+            self.interval = 1.0 / requests_per_second
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+# one limiter per process so every collector shares the same API budget; passing a
+# rate changes it for all of them, leaving it out keeps the current one
+def get_rate_limiter(requests_per_second: Optional[float] = None) -> RateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(requests_per_second or DEFAULT_REQUESTS_PER_SECOND)
+    elif requests_per_second is not None:
+        _rate_limiter.set_rate(requests_per_second)
+    return _rate_limiter
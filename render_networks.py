@@ -0,0 +1,275 @@
+from typing import List, Dict, Optional, Any, Tuple
+import os
+import time
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+
+from bootstrap import worker_pool
+from graph_index import GraphIndex
+from layouts import cached_layout
+
+
+# Batch renderer for the coauthor network figures. A list of (group, year, filename,
+# title) specs is rendered in a process pool: first the base-year layouts, then the
+# later years seeded from them (both through the layout cache), each figure drawn with
+# one LineCollection for all edges and one scatter for all nodes on a bare Agg canvas.
+# Layers with many elements are rasterized so files stay small; "draft" renders at
+# screen resolution for quick checks, "publication" at the 300 dpi the scripts use.
+# Graphs with more than DENSITY_ABOVE edges are drawn as a density raster instead:
+# edge segments and coauthor nodes are accumulated into fixed-size numpy count images
+# in chunks, log scaled and alpha composited, and only participants are drawn as
+# labeled markers on top, so time and memory barely grow with the number of edges.
+#
+#   render_specs(index, [("treatment", 2017, "t2017.jpg", "Treatment 2017")], mode="draft")
+
+MODES = {"draft": 72, "publication": 300}
+
+# collections with more elements than this are drawn as a raster inside the figure
+RASTERIZE_ABOVE = 2000
+
+# drawing="auto" switches to the density raster above this many edges
+DENSITY_ABOVE = 100_000
+
+# longest side of the density raster in pixels, and sample points per accumulation chunk
+MAX_RASTER_SIDE = 2048
+SEGMENT_CHUNK = 1 << 20
+
+# final_code.py's plot_network look
+STYLE = {
+    "figsize": (14, 12),
+    "participant_color": "red",
+    "coauthor_color": "lightblue",
+    "node_alpha": 0.85,
+    "edge_alpha": 0.15,
+    "edge_width": 0.5,
+    "size_per_degree": 50,
+    "min_size": 80,
+    "label_size": 6,
+    "title_size": 16,
+    "edge_color": "black",
+    "background": "white",
+    # density mode: opacity of the densest edge pixel, coauthor dot radius in pixels
+    "density_edge_alpha": 0.9,
+    "density_node_radius": 2,
+}
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(index: GraphIndex, layout_options: Dict[str, Any], drawing: str):
+    _worker.update(index=index, layout_options=layout_options, drawing=drawing)
+
+
+def _new_figure(style: Dict[str, Any]):
+    fig = Figure(figsize=style["figsize"])
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _finish_figure(fig: Figure, ax, title: str, filename: str, dpi: int, style: Dict[str, Any]):
+    ax.set_title(title, fontsize=style["title_size"])
+    ax.axis("off")
+    fig.tight_layout()
+    fig.savefig(filename, dpi=dpi, format=os.path.splitext(filename)[1].lstrip(".") or "jpg")
+
+
+def _label_participants(ax, names: np.ndarray, coords: np.ndarray, style: Dict[str, Any]):
+    for name, (x, y) in zip(names, coords):
+        ax.text(x, y, name, fontsize=style["label_size"], ha="center", va="center", zorder=3)
+
+
+def draw_network(names: np.ndarray, coords: np.ndarray, edges: np.ndarray, degrees: np.ndarray,
+                 participant_mask: np.ndarray, title: str, filename: str, dpi: int,
+                 style: Optional[Dict[str, Any]] = None):
+    style = {**STYLE, **(style or {})}
+    fig, ax = _new_figure(style)
+
+    if len(edges):
+        lines = LineCollection(coords[edges], colors=style["edge_color"], linewidths=style["edge_width"],
+                               alpha=style["edge_alpha"], zorder=1)
+        lines.set_rasterized(len(edges) > RASTERIZE_ABOVE)
+        ax.add_collection(lines)
+
+    colors = np.where(participant_mask, style["participant_color"], style["coauthor_color"])
+    sizes = np.maximum(degrees * style["size_per_degree"], style["min_size"])
+    nodes = ax.scatter(coords[:, 0], coords[:, 1], s=sizes, c=colors, alpha=style["node_alpha"],
+                       linewidths=0, zorder=2)
+    nodes.set_rasterized(len(names) > RASTERIZE_ABOVE)
+
+    _label_participants(ax, names[participant_mask], coords[participant_mask], style)
+    ax.autoscale_view()
+    _finish_figure(fig, ax, title, filename, dpi, style)
+
+
+# (rows, cols) of a raster with the figure's aspect ratio, at most MAX_RASTER_SIDE a side
+def raster_shape(figsize: Tuple[float, float], dpi: int) -> Tuple[int, int]:
+    width, height = figsize[0] * dpi, figsize[1] * dpi
+    scale = min(1.0, MAX_RASTER_SIDE / max(width, height))
+    return max(int(height * scale), 1), max(int(width * scale), 1)
+
+
+# data coordinates -> fractional pixel coordinates (x, y), y pointing up
+def to_pixels(coords: np.ndarray, bounds: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    low, high = bounds
+    span = np.where(high > low, high - low, 1.0)
+    return (coords - low) / span * (np.array([shape[1], shape[0]]) - 1)
+
+
+# how many segment samples fall on each pixel: every edge is sampled about once per pixel
+# of its length, and at most SEGMENT_CHUNK samples are materialized at a time
+def edge_density(pixels: np.ndarray, edges: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    rows, cols = shape
+    counts = np.zeros(rows * cols, dtype=np.float64)
+    if not len(edges):
+        return counts.reshape(shape)
+    start = pixels[edges[:, 0]].astype(np.float32)
+    delta = pixels[edges[:, 1]].astype(np.float32) - start
+    samples = np.ceil(np.sqrt((delta ** 2).sum(axis=1))).astype(np.int64) + 1
+    total = np.cumsum(samples)
+
+    first = 0
+    while first < len(edges):
+        # largest run of edges whose samples fit in one chunk, at least one edge
+        last = max(int(np.searchsorted(total, total[first] - samples[first] + SEGMENT_CHUNK, "right")), first + 1)
+        n = samples[first:last]
+        edge = np.repeat(np.arange(first, last), n)
+        step = np.arange(len(edge)) - np.repeat(np.cumsum(n) - n, n)
+        t = (step / np.repeat(np.maximum(n - 1, 1), n)).astype(np.float32)
+        x = np.clip(np.rint(start[edge, 0] + t * delta[edge, 0]).astype(np.int64), 0, cols - 1)
+        y = np.clip(np.rint(start[edge, 1] + t * delta[edge, 1]).astype(np.int64), 0, rows - 1)
+        counts += np.bincount(y * cols + x, minlength=rows * cols)
+        first = last
+    return counts.reshape(shape)
+
+
+# nodes splatted as (2r+1)^2 pixel squares
+def node_density(pixels: np.ndarray, shape: Tuple[int, int], radius: int = 2) -> np.ndarray:
+    rows, cols = shape
+    counts = np.zeros(rows * cols, dtype=np.float64)
+    x0 = np.rint(pixels[:, 0]).astype(np.int64)
+    y0 = np.rint(pixels[:, 1]).astype(np.int64)
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            x = np.clip(x0 + dx, 0, cols - 1)
+            y = np.clip(y0 + dy, 0, rows - 1)
+            counts += np.bincount(y * cols + x, minlength=rows * cols)
+    return counts.reshape(shape)
+
+
+# log scaled to [0, 1], so single edges stay visible next to dense bundles
+def log_scale(counts: np.ndarray) -> np.ndarray:
+    top = counts.max()
+    return np.log1p(counts) / np.log1p(top) if top > 0 else counts
+
+
+# "over" compositing of solid-colour layers with per-pixel alpha onto the background
+def composite(shape: Tuple[int, int], background: str, layers: List[Tuple[str, np.ndarray]]) -> np.ndarray:
+    image = np.empty(shape + (3,), dtype=np.float32)
+    image[:] = to_rgb(background)
+    for color, alpha in layers:
+        a = alpha.astype(np.float32)[:, :, None]
+        image = image * (1 - a) + np.asarray(to_rgb(color), dtype=np.float32) * a
+    # 8-bit RGB keeps matplotlib's resampling of the raster small
+    return np.round(image * 255).astype(np.uint8)
+
+
+def draw_density(names: np.ndarray, coords: np.ndarray, edges: np.ndarray, degrees: np.ndarray,
+                 participant_mask: np.ndarray, title: str, filename: str, dpi: int,
+                 style: Optional[Dict[str, Any]] = None):
+    style = {**STYLE, **(style or {})}
+    fig, ax = _new_figure(style)
+    shape = raster_shape(style["figsize"], dpi)
+
+    if len(coords):
+        low, high = coords.min(axis=0), coords.max(axis=0)
+        pad = 0.02 * np.maximum(high - low, 1e-9)
+        bounds = np.array([low - pad, high + pad])
+    else:
+        bounds = np.array([[-1.0, -1.0], [1.0, 1.0]])
+    pixels = to_pixels(coords, bounds, shape)
+
+    edge_alpha = style["density_edge_alpha"] * log_scale(edge_density(pixels, edges, shape))
+    coauthors = node_density(pixels[~participant_mask], shape, style["density_node_radius"])
+    node_alpha = style["node_alpha"] * np.minimum(coauthors, 1.0)
+    image = composite(shape, style["background"],
+                      [(style["edge_color"], edge_alpha), (style["coauthor_color"], node_alpha)])
+    ax.imshow(image, origin="lower", extent=(bounds[0, 0], bounds[1, 0], bounds[0, 1], bounds[1, 1]),
+              aspect="auto", interpolation="antialiased", zorder=1)
+
+    # participants stay vector markers with labels, sized by degree like draw_network
+    sizes = np.maximum(degrees[participant_mask] * style["size_per_degree"], style["min_size"])
+    ax.scatter(coords[participant_mask, 0], coords[participant_mask, 1], s=sizes,
+               c=style["participant_color"], alpha=style["node_alpha"], linewidths=0, zorder=2)
+    _label_participants(ax, names[participant_mask], coords[participant_mask], style)
+    ax.set_xlim(bounds[0, 0], bounds[1, 0])
+    ax.set_ylim(bounds[0, 1], bounds[1, 1])
+    _finish_figure(fig, ax, title, filename, dpi, style)
+
+
+# lays out (seeded from init_pos when given), renders, and returns the positions so later
+# years can start from them
+def _render_task(group: str, year: int, filename: str, title: str, dpi: int,
+                 init_pos: Optional[Dict[str, np.ndarray]]) -> Tuple[str, Dict[str, np.ndarray], float]:
+    started = time.perf_counter()
+    index: GraphIndex = _worker["index"]
+    graph = index.graph(group, year)
+    G = index.networkx(group, year)
+    pos = cached_layout(G, init_pos=init_pos, **_worker["layout_options"])
+
+    names = graph.node_names()
+    coords = np.array([pos[n] for n in names]) if len(names) else np.zeros((0, 2))
+    upper = graph.adjacency.tocoo()
+    keep = upper.row < upper.col
+    edges = np.stack([upper.row[keep], upper.col[keep]], axis=1)
+    drawing = _worker["drawing"]
+    if drawing == "auto":
+        drawing = "density" if len(edges) > DENSITY_ABOVE else "vector"
+    draw = draw_density if drawing == "density" else draw_network
+    draw(names, coords, edges, graph.degrees(), graph.participant_mask, title, filename, dpi)
+    return filename, pos, time.perf_counter() - started
+
+
+# specs: (group, year, filename, title); layouts for years after seed_year start from the
+# same cohort's seed_year positions when that spec is in the batch. drawing is "vector",
+# "density" or "auto" (density above DENSITY_ABOVE edges). Layouts use nx.spring_layout
+# like the published figures; the approximate KD-tree engine is opt-in through
+# layout_options={"method": "fast"} or {"method": "auto"}
+def render_specs(index: GraphIndex, specs: List[Tuple[str, int, str, str]], mode: str = "publication",
+                 workers: Optional[int] = None, seed_year: Optional[int] = 2017,
+                 layout_options: Optional[Dict[str, Any]] = None,
+                 drawing: str = "auto") -> Dict[Tuple[str, int], Dict[str, np.ndarray]]:
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {sorted(MODES)}, got {mode!r}")
+    if drawing not in ("vector", "density", "auto"):
+        raise ValueError(f"drawing must be 'vector', 'density' or 'auto', got {drawing!r}")
+    dpi = MODES[mode]
+    layout_options = {"seed": 42, "k": 0.6, "iterations": 200, "method": "spring", **(layout_options or {})}
+
+    seeded_groups = {g for g, y, _, _ in specs if y == seed_year}
+    first = [s for s in specs if s[1] == seed_year or s[0] not in seeded_groups or seed_year is None]
+    later = [s for s in specs if s not in first]
+
+    layouts: Dict[Tuple[str, int], Dict[str, np.ndarray]] = {}
+    workers = min(workers or os.cpu_count() or 1, max(len(first), 1))
+    initargs = (index, layout_options, drawing)
+
+    def run(batch, pool):
+        tasks = [(g, y, f, t, dpi, layouts.get((g, seed_year)) if y != seed_year else None) for g, y, f, t in batch]
+        results = pool.map(_render_task, *zip(*tasks)) if pool else [_render_task(*task) for task in tasks]
+        for (group, year, _, _), (filename, pos, seconds) in zip(batch, results):
+            layouts[(group, year)] = pos
+            print(f"Saved: {filename} ({seconds:.1f}s)")
+
+    if workers == 1:
+        _init_worker(*initargs)
+        for batch in (first, later):
+            run(batch, None)
+    else:
+        with worker_pool(workers, _init_worker, initargs) as pool:
+            for batch in (first, later):
+                if batch:
+                    run(batch, pool)
+    return layouts
@@ -1,61 +1,31 @@
-import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
 import random
 
-df = pd.read_csv("Final_Combined.csv")
-
-def fix_coauthors(x):
-    if pd.isna(x): 
-        return []
-    x = x.strip("[]")
-    if x == "":
-        return []
-    return [name.strip().strip("'").strip('"') for name in x.split(",")]
-
-df["coauthors"] = df["coauthors"].apply(fix_coauthors)
-
+from bootstrap import bootstrap_networks
+from coauthor_network import network_from_rows, select_rows
+from dataset import load_combined
+from graph_index import GraphIndex
+from layouts import cached_layout
 
 def sample_authors_by_seed(participants_set, fraction=0.75, seed=42):
     participants_list = list(participants_set)
-    random.seed(seed)
+    # own generator so the global random module is left alone
+    rng = random.Random(seed)
     num_to_select = int(len(participants_list) * fraction)
-    sampled_authors = random.sample(participants_list, num_to_select)
+    sampled_authors = rng.sample(participants_list, num_to_select)
     return set(sampled_authors)
 
 
 def build_one_year_network(df, group, paper_year, sampled_participants=None):
     
-    subset = df[(df["group"] == group) & (df["paper_year"] == paper_year)]
-    
-    if sampled_participants is not None:
-        subset = subset[subset["author_name"].isin(sampled_participants)]
-    
-    participants = set(subset["author_name"].unique()) 
-    
-    edges = []
-    all_authors = set()
-
-    for _, row in subset.iterrows():
-        author = row["author_name"]
-        coauthors = row["coauthors"]
-        
-        all_authors.add(author)
-        all_authors.update(coauthors)
-        
-        for co in coauthors:
-            edges.append((author, co))
-    
-    G = nx.Graph()
-    G.add_nodes_from(all_authors)
-    G.add_edges_from(edges)
-    
-    return G, participants, all_authors
+    subset = select_rows(df, group, paper_year, sampled_participants)
+    return network_from_rows(subset)
 
 
 def plot_network(G, participants, title, filename):
     plt.figure(figsize=(14, 12))
-    pos = nx.spring_layout(G, seed=42, k=1, iterations=300)
+    pos = cached_layout(G, seed=42, k=1, iterations=300)
     stretch_factor = 1.5 
     for node, coords in pos.items():
         if node in participants:
@@ -108,36 +78,53 @@ def network_summary(G, participants):
     return summary
 
 
-treatment_authors = set(df[df["group"] == "treatment"]["author_name"].unique())
-control_authors = set(df[df["group"] == "control"]["author_name"].unique())
-
-SAMPLED_SEED = 35
-sampled_treatment = sample_authors_by_seed(treatment_authors, fraction=0.75, seed=SAMPLED_SEED)
-sampled_control = sample_authors_by_seed(control_authors, fraction=0.75, seed=SAMPLED_SEED)
-
-network_specs_sampled = [
-    ("treatment", 2017, "75sampled_75_network_treatment_2017.jpg"),
-    ("control",    2017, "75sampled_75_network_control_2017.jpg"),
-    ("treatment", 2023, "75sampled_75_network_treatment_2023.jpg"),
-    ("control",    2023, "75sampled_75_network_control_2023.jpg"),
-]
-
-#debug
-#print("- Starting Sampled Network Analysis (75% of Authors) -")
-
-for cohort, year, file in network_specs_sampled:
-    sampled_authors = sampled_treatment if cohort == "treatment" else sampled_control
-    
-    G, participants, all_nodes = build_one_year_network(df, cohort, year, sampled_authors)
-    
-    title = f"{cohort.capitalize()} Cohort Coauthor Network ({year}, 75% Sampled)"
-        
-    plot_network(G, participants, title, file)
-    
-    summary = network_summary(G, participants)
-    print(f"- {cohort.capitalize()} {year} SAMPLED Network Summary -")
-    for k, v in summary.items():
-        if isinstance(v, float):
-            print(f"{k}: {v:.4f}")
-        else:
-            print(f"{k}: {v}")
\ No newline at end of file
+# the bootstrap runs in a process pool, so the script only runs when started directly
+# and not when a worker imports it
+if __name__ == "__main__":
+    # coauthors come back as lists, country / gender counts as dicts
+    df = load_combined("Final_Combined.csv")
+
+    treatment_authors = set(df[df["group"] == "treatment"]["author_name"].unique())
+    control_authors = set(df[df["group"] == "control"]["author_name"].unique())
+
+    SAMPLED_SEED = 35
+    sampled_treatment = sample_authors_by_seed(treatment_authors, fraction=0.75, seed=SAMPLED_SEED)
+    sampled_control = sample_authors_by_seed(control_authors, fraction=0.75, seed=SAMPLED_SEED)
+
+    network_specs_sampled = [
+        ("treatment", 2017, "75sampled_75_network_treatment_2017.jpg"),
+        ("control",    2017, "75sampled_75_network_control_2017.jpg"),
+        ("treatment", 2023, "75sampled_75_network_treatment_2023.jpg"),
+        ("control",    2023, "75sampled_75_network_control_2023.jpg"),
+    ]
+
+    #debug
+    #print("- Starting Sampled Network Analysis (75% of Authors) -")
+
+    for cohort, year, file in network_specs_sampled:
+        sampled_authors = sampled_treatment if cohort == "treatment" else sampled_control
+
+        G, participants, all_nodes = build_one_year_network(df, cohort, year, sampled_authors)
+
+        title = f"{cohort.capitalize()} Cohort Coauthor Network ({year}, 75% Sampled)"
+
+        plot_network(G, participants, title, file)
+
+        summary = network_summary(G, participants)
+        print(f"- {cohort.capitalize()} {year} SAMPLED Network Summary -")
+        for k, v in summary.items():
+            if isinstance(v, float):
+                print(f"{k}: {v:.4f}")
+            else:
+                print(f"{k}: {v}")
+
+    # the single seed-35 draw above is one sample; resample the 50% / 75% cohorts to get
+    # the spread and 95% intervals of every metric
+    N_BOOTSTRAP = 1000
+    index = GraphIndex(df)
+    draws, intervals = bootstrap_networks(index, fractions=[0.5, 0.75], n_draws=N_BOOTSTRAP,
+                                          specs=[(cohort, year) for cohort, year, _ in network_specs_sampled],
+                                          seed=SAMPLED_SEED)
+    draws.to_csv("sampled_bootstrap_draws.csv", index=False)
+    print(f"- Bootstrap ({N_BOOTSTRAP} draws per cohort, year and fraction) -")
+    print(intervals.to_string(index=False))
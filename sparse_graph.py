@@ -0,0 +1,164 @@
+from typing import Dict, Optional, Any, Set, Tuple
+import numpy as np
+import pandas as pd
+import networkx as nx
+import scipy.sparse as sp
+
+
+# Integer-backed coauthor graphs. Every author and coauthor name in the dataset is
+# interned once (name -> int32), the coauthor lists are stored as one flat int32
+# array with row offsets, and a (group, year) network becomes a symmetric CSR
+# adjacency matrix over local node ids. Degrees, density and the participant /
+# coauthor split are computed on the matrix; to_networkx() is only needed for plotting.
+
+
+class NameIndex:
+    def __init__(self, names: np.ndarray):
+        self.names = np.asarray(names, dtype=object)
+        self._lookup = pd.Index(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # names -> int32 codes, -1 for names not in the index
+    def encode(self, values) -> np.ndarray:
+        return self._lookup.get_indexer(np.asarray(values, dtype=object)).astype(np.int32)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return self.names[np.asarray(codes)]
+
+
+class InternedRows:
+    def __init__(self, index: NameIndex, authors: np.ndarray, coauthors: np.ndarray, offsets: np.ndarray):
+        self.index = index
+        # row i lists coauthors[offsets[i]:offsets[i + 1]]
+        self.authors = authors
+        self.coauthors = coauthors
+        self.offsets = offsets
+
+    # (author, coauthor) code pairs for the given row positions
+    def pairs(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.offsets[positions]
+        counts = self.offsets[positions + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        # flat positions of every listed coauthor: each row's start plus 0..count-1
+        ends = np.cumsum(counts)
+        flat = np.repeat(starts - (ends - counts), counts) + np.arange(total)
+        return np.repeat(self.authors[positions], counts), self.coauthors[flat]
+
+
+# one pass over the dataset: intern every name, flatten the coauthor lists
+def intern_dataset(df: pd.DataFrame) -> InternedRows:
+    lists = df["coauthors"].tolist()
+    counts = np.fromiter((len(c) for c in lists), dtype=np.int64, count=len(lists))
+    flat_names = np.empty(int(counts.sum()), dtype=object)
+    flat_names[:] = [name for c in lists for name in c]
+    author_names = df["author_name"].to_numpy(dtype=object)
+
+    codes, uniques = pd.factorize(np.concatenate([author_names, flat_names]))
+    index = NameIndex(uniques)
+    codes = codes.astype(np.int32)
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return InternedRows(index, codes[:len(author_names)], codes[len(author_names):], offsets)
+
+
+class SparseGraph:
+    def __init__(self, adjacency: sp.csr_matrix, node_codes: np.ndarray, participant_mask: np.ndarray,
+                 index: NameIndex, weighted: bool = False):
+        # symmetric, self-loops stored once on the diagonal; entries are pair counts
+        self.adjacency = adjacency
+        self.node_codes = node_codes
+        self.participant_mask = participant_mask
+        self.index = index
+        self.weighted = weighted
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_codes)
+
+    def number_of_edges(self) -> int:
+        return int(sp.triu(self.adjacency).nnz)
+
+    # networkx convention: a self-loop adds 2 to the degree
+    def degrees(self) -> np.ndarray:
+        A = self.adjacency
+        return np.diff(A.indptr) + (A.diagonal() != 0)
+
+    def weighted_degrees(self) -> np.ndarray:
+        A = self.adjacency
+        return np.asarray(A.sum(axis=1)).ravel() + A.diagonal()
+
+    def density(self) -> float:
+        n = self.number_of_nodes()
+        if n <= 1:
+            return 0.0
+        return self.number_of_edges() / (n * (n - 1) / 2)
+
+    def node_names(self) -> np.ndarray:
+        return self.index.decode(self.node_codes)
+
+    def participants(self) -> Set[str]:
+        return set(self.index.decode(self.node_codes[self.participant_mask]))
+
+    # nodes that are not participants of the cohort, i.e. the unique coauthors
+    def coauthors(self) -> Set[str]:
+        return set(self.index.decode(self.node_codes[~self.participant_mask]))
+
+    def to_networkx(self) -> nx.Graph:
+        names = self.node_names()
+        upper = sp.triu(self.adjacency).tocoo()
+        G = nx.Graph()
+        G.add_nodes_from(names.tolist())
+        if self.weighted:
+            G.add_weighted_edges_from(zip(names[upper.row].tolist(), names[upper.col].tolist(),
+                                          upper.data.tolist()))
+        else:
+            G.add_edges_from(zip(names[upper.row].tolist(), names[upper.col].tolist()))
+        return G
+
+
+def sparse_from_pairs(index: NameIndex, participant_codes: np.ndarray, authors: np.ndarray,
+                      coauthors: np.ndarray, weighted: bool = False) -> SparseGraph:
+    node_codes, local = np.unique(np.concatenate([participant_codes, authors, coauthors]), return_inverse=True)
+    local = local.astype(np.int32)
+    n = len(node_codes)
+    p = len(participant_codes)
+    a = local[p:p + len(authors)]
+    c = local[p + len(authors):]
+    lo, hi = np.minimum(a, c), np.maximum(a, c)
+
+    # duplicates are summed into pair counts, then mirrored below the diagonal
+    upper = sp.csr_matrix((np.ones(len(lo), dtype=np.int32), (lo, hi)), shape=(n, n))
+    upper.sum_duplicates()
+    adjacency = (upper + sp.triu(upper, k=1).T).tocsr()
+    if not weighted:
+        adjacency.data[:] = 1
+
+    participant_mask = np.zeros(n, dtype=bool)
+    participant_mask[local[:p]] = True
+    return SparseGraph(adjacency, node_codes.astype(np.int32), participant_mask, index, weighted)
+
+
+def build_sparse_network(rows: InternedRows, df: pd.DataFrame, group: str, paper_year: int,
+                         participants: Optional[Set[str]] = None, weighted: bool = False) -> SparseGraph:
+    mask = (df["group"] == group).to_numpy() & (df["paper_year"] == paper_year).to_numpy()
+    if participants is not None:
+        mask &= df["author_name"].isin(participants).to_numpy()
+    positions = np.flatnonzero(mask)
+    authors, coauthors = rows.pairs(positions)
+    return sparse_from_pairs(rows.index, rows.authors[positions], authors, coauthors, weighted)
+
+
+# same keys as the scripts' network_summary, without the clustering coefficient
+def sparse_summary(graph: SparseGraph) -> Dict[str, Any]:
+    n = graph.number_of_nodes()
+    return {
+        "num_nodes": n,
+        "num_edges": graph.number_of_edges(),
+        "avg_degree": float(graph.degrees().sum()) / n if n > 0 else 0,
+        "density": graph.density(),
+        "unique_coauthors": int((~graph.participant_mask).sum()),
+    }
@@ -0,0 +1,163 @@
+from typing import Dict, Optional, Any
+from collections import Counter, defaultdict
+import json
+import math
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+
+
+# Run instrumentation for the collectors: per-endpoint request counters, status
+# codes, retries, bytes and latency histograms, plus time spent sleeping (by
+# reason) and pages per author. get_telemetry().dump(path) writes a JSON summary.
+
+# histogram bucket upper bounds, roughly x2 apart, in the unit of what is recorded
+BUCKETS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, math.inf]
+PAGE_BUCKETS = [1, 2, 3, 5, 10, 20, 50, 100, 250, math.inf]
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    # upper bound of the bucket holding the q-th value, capped at the observed max
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return round(min(bound, self.max), 4)
+        return round(self.max, 4)
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "min": round(self.min, 4),
+            "max": round(self.max, 4),
+            "mean": round(self.total / self.count, 4),
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": {("inf" if math.isinf(b) else str(b)): n for b, n in zip(self.buckets, self.counts)},
+        }
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.bytes_received = 0
+        self.status_codes = Counter()
+        self.latency = Histogram()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "bytes_received": self.bytes_received,
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "latency_seconds": self.latency.summary(),
+        }
+
+
+# "/works?...&group_by=..." -> "/works:group_by", so aggregates don't skew page latency
+def endpoint_of(url: str) -> str:
+    parsed = urlparse(url)
+    path = "/" + parsed.path.strip("/").split("/")[0] if parsed.path.strip("/") else "/"
+    if "group_by" in parse_qs(parsed.query):
+        return f"{path}:group_by"
+    return path
+
+
+class Telemetry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+            self.sleep_seconds = Counter()
+            self.sleep_hist: Dict[str, Histogram] = defaultdict(Histogram)
+            self.pages_per_author = Histogram(PAGE_BUCKETS)
+            self.author_seconds = Histogram()
+            self.author_status = Counter()
+
+    def record_request(self, url: str, status: int, latency: float, nbytes: int):
+        with self._lock:
+            stats = self.endpoints[endpoint_of(url)]
+            stats.requests += 1
+            stats.status_codes[status] += 1
+            stats.bytes_received += nbytes
+            stats.latency.add(latency)
+
+    def record_cache_hit(self, url: str):
+        with self._lock:
+            self.endpoints[endpoint_of(url)].cache_hits += 1
+
+    def record_retry(self, url: str):
+        with self._lock:
+            self.endpoints[endpoint_of(url)].retries += 1
+
+    # reason is one of retry_after, server_error, page_pause, rate_limit
+    def record_sleep(self, reason: str, seconds: float):
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.sleep_seconds[reason] += seconds
+            self.sleep_hist[reason].add(seconds)
+
+    def record_author(self, status: str, pages: int, seconds: float):
+        with self._lock:
+            self.author_status[status] += 1
+            self.pages_per_author.add(pages)
+            self.author_seconds.add(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "wall_seconds": round(time.time() - self.started, 3),
+                "endpoints": {name: s.summary() for name, s in sorted(self.endpoints.items())},
+                "sleep_seconds": {k: round(v, 3) for k, v in self.sleep_seconds.items()},
+                "sleep": {k: h.summary() for k, h in self.sleep_hist.items()},
+                "authors": dict(self.author_status),
+                "pages_per_author": self.pages_per_author.summary(),
+                "seconds_per_author": self.author_seconds.summary(),
+            }
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        print(f"Saved telemetry to {path}")
+
+
+_telemetry = Telemetry()
+
+
+# one collector of metrics per process, shared by the sync, async and batched paths
+def get_telemetry() -> Telemetry:
+    return _telemetry
@@ -0,0 +1,171 @@
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+from collections import Counter
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from dataset import load_combined
+from graph_index import GraphIndex
+from network_metrics import average_clustering
+from sparse_graph import InternedRows, NameIndex, SparseGraph
+
+
+# Coauthor networks over time windows instead of single years: cumulative (2017..Y)
+# or sliding N-year windows per cohort. Each year's rows are reduced once to weighted
+# edge and node counts; a window is then advanced by adding the incoming year and
+# subtracting the outgoing one, keeping node / edge / participant totals up to date
+# so the summary metrics for every window come without rebuilding the graph.
+#
+#   for start, end, net in iter_windows(index, "treatment", mode="sliding", window=3):
+#       print(start, end, net.summary())
+
+
+# weighted edge, node and participant counts of a block of rows (a cohort-year, or one
+# author's papers when peeling hubs off a network)
+class YearEdges:
+    def __init__(self, edge_keys: np.ndarray, edge_counts: np.ndarray, node_codes: np.ndarray,
+                 node_counts: np.ndarray, author_codes: np.ndarray, author_counts: np.ndarray, num_papers: int):
+        self.edges = dict(zip(edge_keys.tolist(), edge_counts.tolist()))
+        self.nodes = dict(zip(node_codes.tolist(), node_counts.tolist()))
+        self.authors = dict(zip(author_codes.tolist(), author_counts.tolist()))
+        self.num_papers = num_papers
+
+
+# edge key: lo * n_names + hi for the interned pair, lo <= hi
+def block_edges(rows: InternedRows, positions: np.ndarray) -> YearEdges:
+    n_names = len(rows.index)
+    authors, coauthors = rows.pairs(positions)
+    lo = np.minimum(authors, coauthors).astype(np.int64)
+    hi = np.maximum(authors, coauthors).astype(np.int64)
+    edge_keys, edge_counts = np.unique(lo * n_names + hi, return_counts=True)
+    participant_codes = rows.authors[positions]
+    node_codes, node_counts = np.unique(np.concatenate([participant_codes, coauthors]), return_counts=True)
+    author_codes, author_counts = np.unique(participant_codes, return_counts=True)
+    return YearEdges(edge_keys, edge_counts, node_codes, node_counts, author_codes, author_counts, len(positions))
+
+
+def year_edges(index: GraphIndex, group: str, year: int) -> YearEdges:
+    return block_edges(index.rows, index.positions(group, year))
+
+
+class WindowNetwork:
+    def __init__(self, names: NameIndex):
+        self.names = names
+        # edge key -> weight, name code -> rows / coauthor slots referencing it
+        self.edge_weights: Counter = Counter()
+        self.node_refs: Counter = Counter()
+        self.author_refs: Counter = Counter()
+        self.degree: Counter = Counter()
+        self.num_edges = 0
+        self.num_papers = 0
+
+    def _touch_edge(self, key: int, delta: int):
+        before = self.edge_weights[key]
+        after = before + delta
+        if after:
+            self.edge_weights[key] = after
+        else:
+            del self.edge_weights[key]
+        if (before == 0) == (after == 0):
+            return
+        # the edge appeared or disappeared, a self-loop counts twice like in networkx
+        step = 1 if after else -1
+        self.num_edges += step
+        lo, hi = divmod(key, len(self.names))
+        self.degree[lo] += step
+        self.degree[hi] += step
+        if not self.degree[lo]:
+            del self.degree[lo]
+        if hi != lo and not self.degree[hi]:
+            del self.degree[hi]
+
+    @staticmethod
+    def _shift(counter: Counter, counts: Dict[int, int], sign: int):
+        for key, n in counts.items():
+            value = counter[key] + sign * n
+            if value:
+                counter[key] = value
+            else:
+                del counter[key]
+
+    def add_year(self, year: YearEdges):
+        for key, n in year.edges.items():
+            self._touch_edge(key, n)
+        self._shift(self.node_refs, year.nodes, 1)
+        self._shift(self.author_refs, year.authors, 1)
+        self.num_papers += year.num_papers
+
+    def remove_year(self, year: YearEdges):
+        for key, n in year.edges.items():
+            self._touch_edge(key, -n)
+        self._shift(self.node_refs, year.nodes, -1)
+        self._shift(self.author_refs, year.authors, -1)
+        self.num_papers -= year.num_papers
+
+    # same keys as network_summary plus the window's paper count and total tie weight
+    def summary(self) -> Dict[str, Any]:
+        n = len(self.node_refs)
+        m = self.num_edges
+        return {
+            "num_papers": self.num_papers,
+            "num_nodes": n,
+            "num_edges": m,
+            "total_weight": sum(self.edge_weights.values()),
+            "avg_degree": 2 * m / n if n > 0 else 0,
+            "density": m / (n * (n - 1) / 2) if n > 1 else 0.0,
+            "unique_coauthors": n - len(self.author_refs),
+        }
+
+    # current window as a SparseGraph, for clustering or plotting
+    def snapshot(self, weighted: bool = True) -> SparseGraph:
+        node_codes = np.array(sorted(self.node_refs), dtype=np.int32)
+        keys = np.fromiter(self.edge_weights.keys(), dtype=np.int64, count=len(self.edge_weights))
+        weights = np.fromiter(self.edge_weights.values(), dtype=np.int64, count=len(self.edge_weights))
+        lo = np.searchsorted(node_codes, keys // len(self.names))
+        hi = np.searchsorted(node_codes, keys % len(self.names))
+        n = len(node_codes)
+        upper = sp.csr_matrix((weights if weighted else np.ones_like(weights), (lo, hi)), shape=(n, n))
+        adjacency = (upper + sp.triu(upper, k=1).T).tocsr()
+        participant_mask = np.isin(node_codes, np.fromiter(self.author_refs, dtype=np.int32))
+        return SparseGraph(adjacency, node_codes, participant_mask, self.names, weighted)
+
+
+# yields (first_year, last_year, network) per window; the same WindowNetwork object is
+# advanced in place, call summary() / snapshot() before moving to the next window
+def iter_windows(index: GraphIndex, group: str, mode: str = "cumulative",
+                 window: int = 3) -> Iterator[Tuple[int, int, WindowNetwork]]:
+    if mode not in ("cumulative", "sliding"):
+        raise ValueError(f"mode must be 'cumulative' or 'sliding', got {mode!r}")
+    if window < 1:
+        raise ValueError(f"window must be at least 1 year, got {window!r}")
+    years = index.years
+    per_year = {year: year_edges(index, group, year) for year in years}
+    net = WindowNetwork(index.rows.index)
+    for i, year in enumerate(years):
+        net.add_year(per_year[year])
+        if mode == "sliding":
+            if i >= window:
+                net.remove_year(per_year[years[i - window]])
+            if i < window - 1:
+                continue
+        start = years[0] if mode == "cumulative" else years[i - window + 1]
+        yield start, year, net
+
+
+# clustering=True adds the exact clustering coefficient, computed on a snapshot per window
+def window_metrics_table(index: GraphIndex, mode: str = "cumulative", window: int = 3,
+                         groups: Optional[List[str]] = None, clustering: bool = False) -> pd.DataFrame:
+    records = []
+    for group in groups or index.groups:
+        for start, end, net in iter_windows(index, group, mode, window):
+            record = {"group": group, "mode": mode, "start_year": start, "end_year": end, **net.summary()}
+            if clustering:
+                record["cluster_coefficient"] = average_clustering(net.snapshot(weighted=False))
+            records.append(record)
+    return pd.DataFrame(records)
+
+
+if __name__ == "__main__":
+    index = GraphIndex(load_combined())
+    print(window_metrics_table(index, "cumulative").to_string(index=False))
+    print(window_metrics_table(index, "sliding", window=3).to_string(index=False))